@@ -1,9 +1,9 @@
 
 from .nodes import (
     LoadGGUFPath, LoadGGUFMPROJPath, LoadGGUFDraftPath, 
-    WaitForPassthrough, CallRemoteUrl, WaitForMilliseconds, 
+    WaitForPassthrough, CallRemoteUrl, CallRemoteUrlBatch, WaitForMilliseconds, 
     PollRemoteUrl, MapJsonToProperty, MapJsonArray, 
-    FindJsonElement, SelectFileFromFolder, SelectFromList, MakeJsonList, 
+    FindJsonElement, FindJsonElements, SelectFileFromFolder, SelectFromList, MakeJsonList, 
     AnyAdapter, AnyLazyAdapter, IsNoneNode, NonePrimitiveNode,
     SGSoundPlayer, SGSigmasSlice
 )
@@ -15,10 +15,12 @@ NODE_CLASS_MAPPINGS = {
     "WaitForPassthrough": WaitForPassthrough,
     "WaitForMilliseconds": WaitForMilliseconds,
     "CallRemoteUrl": CallRemoteUrl,
+    "CallRemoteUrlBatch": CallRemoteUrlBatch,
     "PollRemoteUrl": PollRemoteUrl,
     "MapJsonToProperty": MapJsonToProperty,
     "MapJsonArray": MapJsonArray,
     "FindJsonElement": FindJsonElement,
+    "FindJsonElements": FindJsonElements,
     "SelectFileFromFolder": SelectFileFromFolder,
     "SelectFromList": SelectFromList,
     "MakeJsonList": MakeJsonList,
@@ -37,10 +39,12 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     "WaitForPassthrough": "Wait For Passthrough",
     "WaitForMilliseconds": "Wait For Milliseconds",
     "CallRemoteUrl": "Call Remote URL",
+    "CallRemoteUrlBatch": "Call Remote URL (Batch)",
     "PollRemoteUrl": "Poll Remote URL",
     "MapJsonToProperty": "Map JSON To Property",
     "MapJsonArray": "Map JSON Array",
     "FindJsonElement": "Find JSON Element",
+    "FindJsonElements": "Find JSON Elements (Batch)",
     "SelectFileFromFolder": "Select File From Directory",
     "SelectFromList": "Select From List",
     "MakeJsonList": "Make JSON List",
@@ -0,0 +1,63 @@
+import { app } from "../../scripts/app.js";
+import { api } from "../../scripts/api.js";
+
+const GGUF_LOADERS = ["LoadGGUFPath", "LoadGGUFMPROJPath", "LoadGGUFDraftPath"];
+
+const formatParameterCount = (count) => {
+    if (!count) return "unknown";
+    if (count >= 1e9) return `${(count / 1e9).toFixed(2)}B`;
+    if (count >= 1e6) return `${(count / 1e6).toFixed(1)}M`;
+    return String(count);
+};
+
+app.registerExtension({
+    name: "SGNodes.GGUFMetadata",
+    async nodeCreated(node, app) {
+        if (GGUF_LOADERS.includes(node.comfyClass)) {
+            const modelWidget = node.widgets.find((w) => w.name === "model_name");
+
+            if (modelWidget) {
+                const baseTooltip = modelWidget.tooltip || "";
+
+                // Function to show the selected model's header metadata as the widget tooltip
+                const updateTooltip = async () => {
+                    const modelName = modelWidget.value;
+                    if (!modelName) return;
+
+                    try {
+                        const response = await api.fetchApi(`/sg-nodes/gguf_metadata?model_name=${encodeURIComponent(modelName)}`);
+                        if (response.status !== 200) {
+                            modelWidget.tooltip = baseTooltip;
+                            return;
+                        }
+                        const { metadata } = await response.json();
+                        if (!metadata) {
+                            modelWidget.tooltip = baseTooltip;
+                            return;
+                        }
+
+                        modelWidget.tooltip = [
+                            baseTooltip,
+                            `Architecture: ${metadata.architecture || "unknown"}`,
+                            `Quantization: ${metadata.quantization || "unknown"}`,
+                            `Parameters: ${formatParameterCount(metadata.parameter_count)}`,
+                            `Context length: ${metadata.context_length || "unknown"}`,
+                            `Tensors: ${metadata.tensor_count}`,
+                        ].filter(Boolean).join("\n");
+                    } catch (error) {
+                        console.error("Error fetching GGUF metadata:", error);
+                    }
+                };
+
+                // Initial update
+                setTimeout(updateTooltip, 100);
+
+                const originalCallback = modelWidget.callback;
+                modelWidget.callback = function () {
+                    originalCallback?.apply(this, arguments);
+                    updateTooltip();
+                };
+            }
+        }
+    },
+});
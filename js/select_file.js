@@ -1,6 +1,11 @@
 import { app } from "../../scripts/app.js";
 import { api } from "../../scripts/api.js";
 
+// Maximum number of files shown in the dropdown; narrow the list with the filters
+const PAGE_SIZE = 5000;
+// Delay before refreshing after a widget change, so typing doesn't fire a request per keystroke
+const UPDATE_DEBOUNCE_MS = 250;
+
 app.registerExtension({
     name: "SGNodes.SelectFileFromFolder",
     async nodeCreated(node, app) {
@@ -9,9 +14,13 @@ app.registerExtension({
             const extensionsWidget = node.widgets.find((w) => w.name === "extensions");
             const filterTypeWidget = node.widgets.find((w) => w.name === "filter_type");
             const filterTextWidget = node.widgets.find((w) => w.name === "filter_text");
+            const excludeWidget = node.widgets.find((w) => w.name === "exclude");
             const fileWidget = node.widgets.find((w) => w.name === "file_name");
 
             if (folderWidget && fileWidget) {
+                let pendingRequest = null;
+                let debounceTimer = null;
+
                 // Function to update the file list
                 const updateFiles = async () => {
                     const folderPath = folderWidget.value;
@@ -20,11 +29,18 @@ app.registerExtension({
                     const extensions = extensionsWidget ? extensionsWidget.value : "";
                     const filterType = filterTypeWidget ? filterTypeWidget.value : "none";
                     const filterText = filterTextWidget ? filterTextWidget.value : "";
+                    const exclude = excludeWidget ? excludeWidget.value : "";
+
+                    // Only the latest request matters
+                    pendingRequest?.abort();
+                    const controller = new AbortController();
+                    pendingRequest = controller;
 
                     try {
-                        const response = await api.fetchApi(`/sg-nodes/list_files?path=${encodeURIComponent(folderPath)}&extensions=${encodeURIComponent(extensions)}&filter_type=${encodeURIComponent(filterType)}&filter_text=${encodeURIComponent(filterText)}`);
+                        const response = await api.fetchApi(`/sg-nodes/list_files?path=${encodeURIComponent(folderPath)}&extensions=${encodeURIComponent(extensions)}&filter_type=${encodeURIComponent(filterType)}&filter_text=${encodeURIComponent(filterText)}&exclude=${encodeURIComponent(exclude)}&limit=${PAGE_SIZE}`, { signal: controller.signal });
                         if (response.status !== 200) {
-                            console.error("Failed to fetch files:", response.statusText);
+                            const error = await response.json().catch(() => ({}));
+                            console.error("Failed to fetch files:", error.error || response.statusText);
                             fileWidget.options.values = ["Error fetching files"];
                             return;
                         }
@@ -37,8 +53,9 @@ app.registerExtension({
                             fileWidget.options.values = ["No files found"];
                         }
 
-                        // If current value is not in new list, select first available (or keep current if possible)
-                        if (!fileWidget.options.values.includes(fileWidget.value)) {
+                        // If current value is not in new list, select first available (or keep current if possible).
+                        // A truncated list may simply not include the current value, so keep it then.
+                        if (!data.next_cursor && !fileWidget.options.values.includes(fileWidget.value)) {
                             fileWidget.value = fileWidget.options.values[0] || fileWidget.value;
                         }
 
@@ -49,21 +66,29 @@ app.registerExtension({
                         }
 
                     } catch (error) {
+                        if (error.name === "AbortError") return;
                         console.error("Error updating files:", error);
                         fileWidget.options.values = ["Error"];
+                    } finally {
+                        if (pendingRequest === controller) pendingRequest = null;
                     }
                 };
 
+                const scheduleUpdate = () => {
+                    clearTimeout(debounceTimer);
+                    debounceTimer = setTimeout(updateFiles, UPDATE_DEBOUNCE_MS);
+                };
+
                 // Initial update
                 setTimeout(updateFiles, 100);
 
                 // Add callbacks for changes
-                [folderWidget, extensionsWidget, filterTypeWidget, filterTextWidget].forEach(w => {
+                [folderWidget, extensionsWidget, filterTypeWidget, filterTextWidget, excludeWidget].forEach(w => {
                     if (w) {
                         const originalCallback = w.callback;
                         w.callback = function () {
                             originalCallback?.apply(this, arguments);
-                            updateFiles();
+                            scheduleUpdate();
                         };
                     }
                 });
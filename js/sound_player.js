@@ -1,14 +1,90 @@
 import { app } from "../../scripts/app.js";
 import { api } from "../../scripts/api.js";
 
+// Decoded clips are kept per sound id (a content hash), so a repeated sound is fetched once
+const BUFFER_CACHE_MAX_ITEMS = 16;
+const BUFFER_CACHE_MAX_SAMPLES = 64 * 1024 * 1024;
+
 app.registerExtension({
     name: "SGNodes.SoundPlayer",
     async setup() {
         let audioCtx = null;
+        // Map iteration order is insertion order, so re-inserting on use makes it an LRU
+        const bufferCache = new Map();
+        let cachedSamples = 0;
+
+        // Loads in progress per sound id, so concurrent plays of one clip share a single fetch
+        const pendingBuffers = new Map();
+
+        const bufferSamples = (buffer) => buffer.length * buffer.numberOfChannels;
 
-        api.addEventListener("sg-nodes:play_sound", ({ detail }) => {
-            const { waveform, sample_rate, volume } = detail;
-            if (!waveform || !sample_rate) return;
+        const getBuffer = async (detail) => {
+            const cached = bufferCache.get(detail.sound_id);
+            if (cached) {
+                bufferCache.delete(detail.sound_id);
+                bufferCache.set(detail.sound_id, cached);
+                return cached;
+            }
+
+            let pending = pendingBuffers.get(detail.sound_id);
+            if (!pending) {
+                pending = loadBuffer(detail).finally(() => pendingBuffers.delete(detail.sound_id));
+                pendingBuffers.set(detail.sound_id, pending);
+                pending.then((buffer) => cacheBuffer(detail.sound_id, buffer), () => {});
+            }
+            return await pending;
+        };
+
+        const cacheBuffer = (soundId, buffer) => {
+            const previous = bufferCache.get(soundId);
+            if (previous) {
+                bufferCache.delete(soundId);
+                cachedSamples -= bufferSamples(previous);
+            }
+            bufferCache.set(soundId, buffer);
+            cachedSamples += bufferSamples(buffer);
+            while (bufferCache.size > 1 && (bufferCache.size > BUFFER_CACHE_MAX_ITEMS || cachedSamples > BUFFER_CACHE_MAX_SAMPLES)) {
+                const [oldestId, oldest] = bufferCache.entries().next().value;
+                bufferCache.delete(oldestId);
+                cachedSamples -= bufferSamples(oldest);
+            }
+        };
+
+        // Fetch the encoded clip and turn it into an AudioBuffer
+        const loadBuffer = async ({ sound_id, format, channels, frames, sample_rate }) => {
+            const response = await api.fetchApi(`/sg-nodes/sound/${sound_id}`);
+            if (response.status !== 200) {
+                throw new Error(`Failed to fetch sound: ${response.statusText}`);
+            }
+            const data = await response.arrayBuffer();
+
+            if (format === "wav") {
+                return await audioCtx.decodeAudioData(data);
+            }
+
+            // Raw formats are planar: all of channel 0, then channel 1, ...
+            let samples;
+            if (format === "s16") {
+                const pcm = new Int16Array(data);
+                samples = new Float32Array(pcm.length);
+                for (let i = 0; i < pcm.length; i++) {
+                    samples[i] = pcm[i] / 32768;
+                }
+            } else {
+                samples = new Float32Array(data);
+            }
+
+            const buffer = audioCtx.createBuffer(channels, frames, sample_rate);
+            for (let channel = 0; channel < channels; channel++) {
+                // subarray is a view, so each channel is a single copy
+                buffer.copyToChannel(samples.subarray(channel * frames, (channel + 1) * frames), channel);
+            }
+            return buffer;
+        };
+
+        api.addEventListener("sg-nodes:play_sound", async ({ detail }) => {
+            const { sound_id, sample_rate, volume } = detail;
+            if (!sound_id || !sample_rate) return;
 
             try {
                 if (!audioCtx) {
@@ -19,17 +95,7 @@ app.registerExtension({
                     audioCtx.resume();
                 }
 
-                const numChannels = waveform.length;
-                const length = waveform[0].length;
-                const buffer = audioCtx.createBuffer(numChannels, length, sample_rate);
-
-                for (let channel = 0; channel < numChannels; channel++) {
-                    const channelData = buffer.getChannelData(channel);
-                    // waveform[channel] is a regular array, we need to copy it to the Float32Array
-                    for (let i = 0; i < length; i++) {
-                        channelData[i] = waveform[channel][i];
-                    }
-                }
+                const buffer = await getBuffer(detail);
 
                 const source = audioCtx.createBufferSource();
                 source.buffer = buffer;
@@ -1,55 +1,421 @@
 import os
+import torch
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import http.cookiejar
 import json
 import folder_paths
 from comfy.comfy_types import IO, ComfyNodeABC, InputTypeDict
-from typing import Dict, Any, List
+import comfy.model_management
+from typing import Dict, Any, List, Optional, Tuple, Callable, NamedTuple, Iterator
+import functools
+import contextlib
+import copy
 import time
+import math
+import random
+import threading
+from dataclasses import dataclass
+from collections import OrderedDict
 import re
+import mmap
+import struct
+import codecs
+import hashlib
+import sqlite3
+import io
+import wave
+import email.utils
+import asyncio
+import fnmatch
+import bisect
+from concurrent.futures import ThreadPoolExecutor, Future
 from server import PromptServer
 from aiohttp import web
 
 # Config file path
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), 'config.json')
 
-def load_config() -> Dict[str, Any]:
-    """Load config from config.json, return empty dict if not found or invalid."""
+@dataclass(frozen=True)
+class SGNodesSettings:
+    """Validated settings from config.json."""
+    model_folders: Tuple[str, ...] = ()
+    scan_max_depth: int = -1
+    scan_ignore_patterns: Tuple[str, ...] = (".*",)
+    http_pool_size: int = 10
+    http_max_retries: int = 0
+    http_backoff_factor: float = 0.5
+    http_retry_statuses: Tuple[int, ...] = (502, 503, 504)
+    http_coalesce_methods: Tuple[str, ...] = ("GET", "HEAD")
+    file_index_enabled: bool = False
+    file_index_folders: Tuple[str, ...] = ()
+    file_index_interval_seconds: float = 30.0
+
+def _validate_str_list(value: Any) -> Tuple[str, ...]:
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError("expected a list of strings")
+    return tuple(value)
+
+def _validate_method_list(value: Any) -> Tuple[str, ...]:
+    return tuple(method.upper() for method in _validate_str_list(value))
+
+def _validate_depth(value: Any) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < -1:
+        raise ValueError("expected an integer >= -1")
+    return value
+
+def _validate_positive_int(value: Any) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError("expected an integer >= 1")
+    return value
+
+def _validate_non_negative_int(value: Any) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError("expected an integer >= 0")
+    return value
+
+def _validate_non_negative_float(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ValueError("expected a number >= 0")
+    return float(value)
+
+def _validate_interval(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 1:
+        raise ValueError("expected a number of seconds >= 1")
+    return float(value)
+
+def _validate_bool(value: Any) -> bool:
+    if not isinstance(value, bool):
+        raise ValueError("expected true or false")
+    return value
+
+def _validate_int_list(value: Any) -> Tuple[int, ...]:
+    if not isinstance(value, list) or not all(isinstance(v, int) and not isinstance(v, bool) for v in value):
+        raise ValueError("expected a list of integers")
+    return tuple(value)
+
+# config.json key -> validator returning the value stored on SGNodesSettings
+_CONFIG_SCHEMA = {
+    "model_folders": _validate_str_list,
+    "scan_max_depth": _validate_depth,
+    "scan_ignore_patterns": _validate_str_list,
+    "http_pool_size": _validate_positive_int,
+    "http_max_retries": _validate_non_negative_int,
+    "http_backoff_factor": _validate_non_negative_float,
+    "http_retry_statuses": _validate_int_list,
+    "http_coalesce_methods": _validate_method_list,
+    "file_index_enabled": _validate_bool,
+    "file_index_folders": _validate_str_list,
+    "file_index_interval_seconds": _validate_interval,
+}
+
+def _validate_config(config: Dict[str, Any]) -> SGNodesSettings:
+    """Build settings from a parsed config, keeping defaults for invalid or missing keys."""
+    values = {}
+    for key, value in config.items():
+        validator = _CONFIG_SCHEMA.get(key)
+        if validator is None:
+            print(f"SG Nodes config: ignoring unknown key '{key}'")
+            continue
+        try:
+            values[key] = validator(value)
+        except ValueError as e:
+            print(f"SG Nodes config: invalid value for '{key}': {e}")
+    return SGNodesSettings(**values)
+
+# Parsed config is cached keyed on the file's (mtime, size) and only re-read
+# and re-validated when the file changes.
+_config_lock = threading.Lock()
+_config_cache: Dict[str, Any] = {"key": None, "config": {}, "settings": SGNodesSettings()}
+
+def _config_file_key() -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(CONFIG_FILE)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _read_config_file() -> Dict[str, Any]:
     try:
         with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+            config = json.load(f)
+    except (OSError, json.JSONDecodeError):
         return {}
+    if not isinstance(config, dict):
+        print("SG Nodes config: expected a JSON object at the top level")
+        return {}
+    return config
+
+def _get_cached_config() -> Dict[str, Any]:
+    key = _config_file_key()
+    with _config_lock:
+        if key != _config_cache["key"]:
+            config = _read_config_file() if key is not None else {}
+            _config_cache["config"] = config
+            _config_cache["settings"] = _validate_config(config)
+            _config_cache["key"] = key
+        return _config_cache
+
+def load_config() -> Dict[str, Any]:
+    """Load config from config.json, return empty dict if not found or invalid."""
+    return dict(_get_cached_config()["config"])
+
+def get_settings() -> SGNodesSettings:
+    """Return validated settings, re-reading config.json only when it changed."""
+    return _get_cached_config()["settings"]
 
 def get_user_model_folders() -> List[str]:
     """Get user-specified model folders from config."""
-    config = load_config()
-    return config.get('model_folders', [])
+    return list(get_settings().model_folders)
 
-def get_merged_model_folders() -> List[str]:
-    """Merge ComfyUI text_encoders folders with user folders."""
+def _get_configured_model_folders() -> List[str]:
+    """ComfyUI text_encoders folders followed by user folders, without existence checks."""
     try:
         comfy_folders = folder_paths.get_folder_paths("text_encoders")
     except:
         comfy_folders = []
     user_folders = get_user_model_folders()
-    all_folders = comfy_folders + user_folders
+    return comfy_folders + user_folders
+
+def get_merged_model_folders() -> List[str]:
+    """Merge ComfyUI text_encoders folders with user folders."""
+    all_folders = _get_configured_model_folders()
     # Filter out non-existent paths
     return [f for f in all_folders if os.path.exists(f)]
 
+# Directory listing cache shared by the folder scanners.
+# (path, follow_symlinks) -> (mtime_ns, (st_dev, st_ino), file names, subdirectory names)
+# A cached listing is reused while the directory mtime is unchanged, so
+# revalidating a known tree costs one stat per directory. Least recently
+# used listings are dropped beyond DIR_LISTING_CACHE_MAX_ENTRIES.
+DIR_LISTING_CACHE_MAX_ENTRIES = 65536
+_dir_listing_lock = threading.Lock()
+_dir_listing_cache: "OrderedDict[Tuple[str, bool], Tuple[int, Tuple[int, int], Tuple[str, ...], Tuple[str, ...]]]" = OrderedDict()
+
+def _get_dir_listing(path: str, follow_symlinks: bool) -> Optional[Tuple[int, Tuple[int, int], Tuple[str, ...], Tuple[str, ...]]]:
+    key = (path, follow_symlinks)
+    with _dir_listing_lock:
+        listing = _dir_listing_cache.get(key)
+        if listing is not None:
+            _dir_listing_cache.move_to_end(key)
+        return listing
+
+def _put_dir_listing(path: str, follow_symlinks: bool, listing: Optional[Tuple[int, Tuple[int, int], Tuple[str, ...], Tuple[str, ...]]],
+                     replace: bool = True) -> None:
+    """Store a listing, or drop the cached one when listing is None."""
+    key = (path, follow_symlinks)
+    with _dir_listing_lock:
+        if listing is None:
+            _dir_listing_cache.pop(key, None)
+            return
+        if not replace and key in _dir_listing_cache:
+            return
+        _dir_listing_cache[key] = listing
+        _dir_listing_cache.move_to_end(key)
+        while len(_dir_listing_cache) > DIR_LISTING_CACHE_MAX_ENTRIES:
+            _dir_listing_cache.popitem(last=False)
+
+def _list_directory(path: str, revalidate: bool = True,
+                    follow_symlinks: bool = False) -> Optional[Tuple[int, Tuple[int, int], Tuple[str, ...], Tuple[str, ...]]]:
+    """List a directory's files and subdirectories, reusing the cached listing while its mtime is unchanged.
+
+    Unless follow_symlinks is set, symlinks to directories are left out like
+    os.walk does, so they are never descended into. With revalidate=False a
+    cached listing is returned without touching the disk.
+    """
+    if not revalidate:
+        cached = _get_dir_listing(path, follow_symlinks)
+        if cached is not None:
+            return cached
+    try:
+        st = os.stat(path)
+    except OSError:
+        _put_dir_listing(path, follow_symlinks, None)
+        return None  # Missing or inaccessible folder
+
+    cached = _get_dir_listing(path, follow_symlinks)
+    if cached is not None and cached[0] == st.st_mtime_ns:
+        return cached
+
+    files, dirs = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                # DirEntry caches the dirent type, so no extra stat is needed here
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        dirs.append(entry.name)
+                    elif not entry.is_dir():
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        _put_dir_listing(path, follow_symlinks, None)
+        return None
+
+    listing = (st.st_mtime_ns, (st.st_dev, st.st_ino), tuple(files), tuple(dirs))
+    _put_dir_listing(path, follow_symlinks, listing)
+    return listing
+
+def _compile_ignore_patterns(patterns: Tuple[str, ...]) -> Optional["re.Pattern"]:
+    """Compile glob ignore patterns into one regex, or None when there are none."""
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+def _walk_directory_tree(root: str, max_depth: int = -1, ignore: Optional["re.Pattern"] = None,
+                         revalidate: bool = True, follow_symlinks: bool = False) -> Optional[Tuple[List[Tuple[str, Tuple[str, ...]]], Tuple]]:
+    """Recursively list root using the directory listing cache.
+
+    Returns (entries, signature): entries are (relative dir, file names) pairs in
+    walk order, and the signature lists the mtime of every visited directory.
+    Returns None when root cannot be listed. With follow_symlinks, linked
+    directories are descended into and each directory is listed once, so
+    symlink loops end.
+    """
+    entries = []
+    signature = []
+    visited = set()
+    stack = [(root, "", 0)]
+    while stack:
+        path, rel_dir, depth = stack.pop()
+        listing = _list_directory(path, revalidate, follow_symlinks)
+        if listing is None:
+            if not rel_dir:
+                return None
+            continue
+        mtime, dir_id, files, dirs = listing
+        if dir_id in visited:
+            continue  # Symlink loop or already listed through another path
+        visited.add(dir_id)
+        signature.append((path, mtime))
+
+        if ignore is not None:
+            files = tuple(name for name in files if not _is_ignored(ignore, rel_dir, name))
+        entries.append((rel_dir, files))
+
+        if max_depth >= 0 and depth >= max_depth:
+            continue
+        # Reversed so the stack pops subdirectories in listing order
+        for name in reversed(dirs):
+            if ignore is not None and _is_ignored(ignore, rel_dir, name):
+                continue
+            rel_path = os.path.join(rel_dir, name) if rel_dir else name
+            stack.append((os.path.join(path, name), rel_path, depth + 1))
+
+    return entries, tuple(signature)
+
+def _is_ignored(ignore: "re.Pattern", rel_dir: str, name: str) -> bool:
+    if ignore.match(name):
+        return True
+    return bool(rel_dir) and bool(ignore.match(os.path.join(rel_dir, name).replace(os.sep, "/")))
+
+def _scan_gguf_tree(root: str, max_depth: int, ignore: Optional["re.Pattern"]) -> Optional[Tuple[List[str], Tuple]]:
+    """Recursively collect GGUF files under root as (relative paths, signature)."""
+    # Model folders are often symlinked to other drives, so follow links here
+    walk = _walk_directory_tree(root, max_depth, ignore, follow_symlinks=True)
+    if walk is None:
+        return None
+    entries, signature = walk
+    models = []
+    for rel_dir, files in entries:
+        for name in files:
+            if name.lower().endswith('.gguf'):
+                models.append(os.path.join(rel_dir, name) if rel_dir else name)
+    return models, signature
+
+# Process-wide GGUF model index shared by all GGUF loader nodes.
+# Rebuilt only when the signature (visited directories and their mtimes) changes.
+_gguf_index_lock = threading.Lock()
+_gguf_index: Dict[str, Any] = {"signature": None, "buckets": None, "paths": {}}
+_scan_executor: Optional[ThreadPoolExecutor] = None
+
+def _get_scan_executor() -> ThreadPoolExecutor:
+    global _scan_executor
+    if _scan_executor is None:
+        _scan_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="sg-nodes-scan")
+    return _scan_executor
+
+def _partition_gguf_models(model_list: List[str]) -> Dict[str, List[str]]:
+    """Split GGUF model names into the buckets used by the loader nodes."""
+    general, mmproj, draft = [], [], []
+    for name in model_list:
+        lower = name.lower()
+        is_mmproj = 'mmproj' in lower
+        is_draft = 'draft' in lower
+        if is_mmproj:
+            mmproj.append(name)
+        if is_draft:
+            draft.append(name)
+        if not is_mmproj and not is_draft:
+            general.append(name)
+    return {"all": model_list, "general": general, "mmproj": mmproj, "draft": draft}
+
+def get_gguf_model_buckets() -> Dict[str, List[str]]:
+    """Return the cached GGUF model index, partitioned into all/general/mmproj/draft."""
+    settings = get_settings()
+    # Missing folders are skipped by the stat in _list_directory
+    folders = _get_configured_model_folders()
+    ignore = _compile_ignore_patterns(settings.scan_ignore_patterns)
+    with _gguf_index_lock:
+        # One scan per top-level folder, fanned out across the pool
+        if len(folders) > 1:
+            scans = list(_get_scan_executor().map(
+                lambda folder: _scan_gguf_tree(folder, settings.scan_max_depth, ignore), folders))
+        else:
+            scans = [_scan_gguf_tree(folder, settings.scan_max_depth, ignore) for folder in folders]
+
+        model_list = []
+        signature = []
+        listings = []
+        for folder, scan in zip(folders, scans):
+            if scan is None:
+                continue
+            files, folder_signature = scan
+            signature.append(folder_signature)
+            listings.append((folder, files))
+            model_list.extend(files)
+
+        signature = (settings.scan_max_depth, settings.scan_ignore_patterns, tuple(signature))
+        if _gguf_index["signature"] != signature:
+            # Name -> path map; the first folder containing a name wins,
+            # matching the folder order used by the slow path in find_model_path
+            paths = {}
+            for folder, files in listings:
+                for name in files:
+                    if name not in paths:
+                        paths[name] = os.path.join(folder, name)
+            _gguf_index["signature"] = signature
+            _gguf_index["buckets"] = _partition_gguf_models(model_list)
+            _gguf_index["paths"] = paths
+        return _gguf_index["buckets"]
+
 def scan_gguf_models_in_folders() -> List[str]:
     """Scan merged folders for GGUF model files."""
-    folders = get_merged_model_folders()
-    model_list = []
-    for folder in folders:
-        try:
-            files = os.listdir(folder)
-            model_list.extend([f for f in files if f.lower().endswith('.gguf')])
-        except:
-            pass  # Skip inaccessible folders
-    return model_list
+    return list(get_gguf_model_buckets()["all"])
+
+def find_indexed_model_path(model_name: str) -> Optional[str]:
+    """Path of a model listed in the GGUF index, or None; names outside the index are never resolved."""
+    # One stat confirms an index hit wasn't deleted since the last scan
+    path = _gguf_index["paths"].get(model_name)
+    if path is not None and os.path.isfile(path):
+        return path
+
+    # Miss: refresh the index in case the model was added or moved since the last scan
+    get_gguf_model_buckets()
+    path = _gguf_index["paths"].get(model_name)
+    if path is not None and os.path.isfile(path):
+        return path
+    return None
 
 def find_model_path(model_name: str) -> str:
     """Find full path to model in merged folders."""
+    path = find_indexed_model_path(model_name)
+    if path is not None:
+        return path
+
+    # Slow path for names the index does not know about
     folders = get_merged_model_folders()
     for folder in folders:
         path = os.path.join(folder, model_name)
@@ -58,13 +424,187 @@ def find_model_path(model_name: str) -> str:
     return None
 
 
+# GGUF header parsing. Only the header and metadata/tensor-info section is
+# touched through a read-only mmap, so tensor data is never read.
+GGUF_MAGIC = b"GGUF"
+_GGUF_TYPE_STRING = 8
+_GGUF_TYPE_ARRAY = 9
+# GGUF metadata value type -> struct format
+_GGUF_SCALAR_FORMATS = {
+    0: "<B", 1: "<b", 2: "<H", 3: "<h", 4: "<I", 5: "<i",
+    6: "<f", 7: "<?", 10: "<Q", 11: "<q", 12: "<d",
+}
+# llama_ftype values stored in general.file_type
+_GGUF_FILE_TYPES = {
+    0: "F32", 1: "F16", 2: "Q4_0", 3: "Q4_1", 7: "Q8_0", 8: "Q5_0", 9: "Q5_1",
+    10: "Q2_K", 11: "Q3_K_S", 12: "Q3_K_M", 13: "Q3_K_L", 14: "Q4_K_S", 15: "Q4_K_M",
+    16: "Q5_K_S", 17: "Q5_K_M", 18: "Q6_K", 19: "IQ2_XXS", 20: "IQ2_XS", 21: "Q2_K_S",
+    22: "IQ3_XS", 23: "IQ3_XXS", 24: "IQ1_S", 25: "IQ4_NL", 26: "IQ3_S", 27: "IQ3_M",
+    28: "IQ2_S", 29: "IQ2_M", 30: "IQ4_XS", 31: "IQ1_M", 32: "BF16", 36: "TQ1_0", 37: "TQ2_0",
+}
+# ggml_type values stored per tensor, used when general.file_type is missing
+_GGML_TENSOR_TYPES = {
+    0: "F32", 1: "F16", 2: "Q4_0", 3: "Q4_1", 6: "Q5_0", 7: "Q5_1", 8: "Q8_0", 9: "Q8_1",
+    10: "Q2_K", 11: "Q3_K", 12: "Q4_K", 13: "Q5_K", 14: "Q6_K", 15: "Q8_K",
+    16: "IQ2_XXS", 17: "IQ2_XS", 18: "IQ3_XXS", 19: "IQ1_S", 20: "IQ4_NL", 21: "IQ3_S",
+    22: "IQ2_S", 23: "IQ4_XS", 24: "I8", 25: "I16", 26: "I32", 27: "I64", 28: "F64",
+    29: "IQ1_M", 30: "BF16", 34: "TQ1_0", 35: "TQ2_0",
+}
+
+def read_gguf_metadata(path: str) -> Dict[str, Any]:
+    """Parse a GGUF header and return architecture, quantization, parameter/context/tensor counts."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[:4] != GGUF_MAGIC:
+            raise ValueError(f"Not a GGUF file: {path}")
+        version, = struct.unpack_from("<I", mm, 4)
+        # GGUF v1 used 32-bit counts and string lengths
+        count_fmt = "<I" if version == 1 else "<Q"
+        count_size = struct.calcsize(count_fmt)
+        offset = 8
+
+        def read_count():
+            nonlocal offset
+            value, = struct.unpack_from(count_fmt, mm, offset)
+            offset += count_size
+            return value
+
+        def read_string():
+            nonlocal offset
+            length = read_count()
+            value = mm[offset:offset + length].decode('utf-8', errors='replace')
+            offset += length
+            return value
+
+        def skip_value(value_type, count=1):
+            nonlocal offset
+            if value_type == _GGUF_TYPE_STRING:
+                for _ in range(count):
+                    length = read_count()
+                    offset += length
+            elif value_type == _GGUF_TYPE_ARRAY:
+                for _ in range(count):
+                    item_type, = struct.unpack_from("<I", mm, offset)
+                    offset += 4
+                    skip_value(item_type, read_count())
+            else:
+                offset += struct.calcsize(_GGUF_SCALAR_FORMATS[value_type]) * count
+
+        tensor_count = read_count()
+        kv_count = read_count()
+
+        # Keep scalar and string values; arrays (e.g. tokenizer vocab) are skipped
+        kv = {}
+        for _ in range(kv_count):
+            key = read_string()
+            value_type, = struct.unpack_from("<I", mm, offset)
+            offset += 4
+            if value_type == _GGUF_TYPE_STRING:
+                kv[key] = read_string()
+            elif value_type in _GGUF_SCALAR_FORMATS:
+                kv[key], = struct.unpack_from(_GGUF_SCALAR_FORMATS[value_type], mm, offset)
+                skip_value(value_type)
+            else:
+                skip_value(value_type)
+
+        parameter_count = 0
+        type_elements: Dict[int, int] = {}
+        for _ in range(tensor_count):
+            read_string()  # tensor name
+            n_dims, = struct.unpack_from("<I", mm, offset)
+            offset += 4
+            elements = 1
+            for _ in range(n_dims):
+                elements *= read_count()
+            tensor_type, = struct.unpack_from("<I", mm, offset)
+            offset += 4 + 8  # type + data offset
+            parameter_count += elements
+            type_elements[tensor_type] = type_elements.get(tensor_type, 0) + elements
+
+    architecture = kv.get("general.architecture", "")
+    quantization = _GGUF_FILE_TYPES.get(kv.get("general.file_type"), "")
+    if not quantization and type_elements:
+        dominant_type = max(type_elements, key=type_elements.get)
+        quantization = _GGML_TENSOR_TYPES.get(dominant_type, str(dominant_type))
+
+    return {
+        "architecture": architecture,
+        "quantization": quantization,
+        "parameter_count": parameter_count,
+        "context_length": int(kv.get(f"{architecture}.context_length", 0) or 0),
+        "tensor_count": tensor_count,
+    }
+
+# On-disk GGUF metadata index: path -> {"size", "mtime_ns", "metadata"}.
+# Loaded lazily and rewritten whenever a new file is parsed.
+GGUF_METADATA_CACHE_FILE = os.path.join(os.path.dirname(__file__), 'gguf_metadata_cache.json')
+_gguf_metadata_lock = threading.Lock()
+_gguf_metadata_cache: Optional[Dict[str, Dict[str, Any]]] = None
+
+def _load_gguf_metadata_cache() -> Dict[str, Dict[str, Any]]:
+    global _gguf_metadata_cache
+    if _gguf_metadata_cache is None:
+        try:
+            with open(GGUF_METADATA_CACHE_FILE, 'r') as f:
+                _gguf_metadata_cache = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            _gguf_metadata_cache = {}
+        if not isinstance(_gguf_metadata_cache, dict):
+            _gguf_metadata_cache = {}
+    return _gguf_metadata_cache
+
+def _save_gguf_metadata_cache(cache: Dict[str, Dict[str, Any]]) -> None:
+    tmp_file = GGUF_METADATA_CACHE_FILE + ".tmp"
+    try:
+        with open(tmp_file, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, GGUF_METADATA_CACHE_FILE)
+    except OSError as e:
+        print(f"Failed to save GGUF metadata cache: {e}")
+
+def get_gguf_metadata(path: str) -> Optional[Dict[str, Any]]:
+    """Return cached GGUF metadata for path, parsing the header only when size or mtime changed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    with _gguf_metadata_lock:
+        cache = _load_gguf_metadata_cache()
+        entry = cache.get(path)
+        if entry is not None and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+            return entry["metadata"]
+
+    try:
+        metadata = read_gguf_metadata(path)
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        print(f"Failed to read GGUF metadata from {path}: {e}")
+        return None
+
+    with _gguf_metadata_lock:
+        cache = _load_gguf_metadata_cache()
+        cache[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "metadata": metadata}
+        _save_gguf_metadata_cache(cache)
+    return metadata
+
+@PromptServer.instance.routes.get("/sg-nodes/gguf_metadata")
+async def gguf_metadata_endpoint(request):
+    model_name = request.rel_url.query.get("model_name", "")
+    if not model_name:
+        return web.json_response({"metadata": None}, status=404)
+    loop = asyncio.get_running_loop()
+    # Only models the loaders list can be read, never arbitrary paths from the query
+    model_path = await loop.run_in_executor(None, find_indexed_model_path, model_name)
+    if model_path is None:
+        return web.json_response({"metadata": None}, status=404)
+    metadata = await loop.run_in_executor(None, get_gguf_metadata, model_path)
+    return web.json_response({"metadata": metadata})
+
+
 class LoadGGUFPath(ComfyNodeABC):
     @classmethod
     def INPUT_TYPES(cls) -> InputTypeDict:
-        model_list = scan_gguf_models_in_folders()
-
-        # Filter for general GGUF models (exclude mmproj and draft)
-        general_models = [f for f in model_list if 'mmproj' not in f.lower() and 'draft' not in f.lower()]
+        # General GGUF models (mmproj and draft excluded)
+        general_models = get_gguf_model_buckets()["general"]
 
         return {
             "required": {
@@ -72,8 +612,8 @@ class LoadGGUFPath(ComfyNodeABC):
             }
         }
 
-    RETURN_TYPES = ("STRING",)
-    RETURN_NAMES = ("model_path",)
+    RETURN_TYPES = ("STRING", "STRING", "STRING", "INT", "INT", "INT")
+    RETURN_NAMES = ("model_path", "architecture", "quantization", "parameter_count", "context_length", "tensor_count")
     FUNCTION = "load_path"
     CATEGORY = "SGNodes/GGUF Loaders"
 
@@ -87,19 +627,25 @@ class LoadGGUFPath(ComfyNodeABC):
             if not model_name.lower().endswith('.gguf'):
                 raise ValueError(f"Selected file is not a GGUF model: {model_name}")
 
-            return (model_path,)
-
         except Exception as e:
             raise RuntimeError(f"Failed to load model path: {str(e)}")
 
+        # Metadata is informational; an unreadable header doesn't fail the path lookup
+        metadata = get_gguf_metadata(model_path) or {}
+        return (
+            model_path,
+            metadata.get("architecture", ""),
+            metadata.get("quantization", ""),
+            metadata.get("parameter_count", 0),
+            metadata.get("context_length", 0),
+            metadata.get("tensor_count", 0),
+        )
+
 
 class LoadGGUFMPROJPath(ComfyNodeABC):
     @classmethod
     def INPUT_TYPES(cls) -> InputTypeDict:
-        model_list = scan_gguf_models_in_folders()
-
-        # Filter for mmproj models
-        mmproj_models = [f for f in model_list if 'mmproj' in f.lower()]
+        mmproj_models = get_gguf_model_buckets()["mmproj"]
 
         return {
             "required": {
@@ -131,10 +677,7 @@ class LoadGGUFMPROJPath(ComfyNodeABC):
 class LoadGGUFDraftPath(ComfyNodeABC):
     @classmethod
     def INPUT_TYPES(cls) -> InputTypeDict:
-        model_list = scan_gguf_models_in_folders()
-
-        # Filter for draft models
-        draft_models = [f for f in model_list if 'draft' in f.lower()]
+        draft_models = get_gguf_model_buckets()["draft"]
 
         return {
             "required": {
@@ -186,6 +729,36 @@ class WaitForPassthrough(ComfyNodeABC):
         return (passthrough,)
 
 
+# How often async nodes check whether the prompt was interrupted while waiting
+INTERRUPT_CHECK_SECONDS = 0.05
+
+async def interruptible_sleep(seconds: float) -> None:
+    """Sleep in short slices, raising as soon as the prompt is interrupted."""
+    deadline = time.perf_counter() + seconds
+    while True:
+        comfy.model_management.throw_exception_if_processing_interrupted()
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(min(remaining, INTERRUPT_CHECK_SECONDS))
+
+async def run_interruptible(func: Callable, *args, **kwargs) -> Any:
+    """Run func in a worker thread, but stop waiting for it once the prompt is interrupted.
+
+    A blocking call can't be cancelled, so an interrupted call finishes in the
+    background and its result is discarded.
+    """
+    task = asyncio.ensure_future(asyncio.to_thread(func, *args, **kwargs))
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=INTERRUPT_CHECK_SECONDS)
+        if done:
+            return task.result()
+        if comfy.model_management.processing_interrupted():
+            # Retrieve the abandoned call's outcome so asyncio doesn't warn about it
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            comfy.model_management.throw_exception_if_processing_interrupted()
+
+
 class WaitForMilliseconds(ComfyNodeABC):
     @classmethod
     def INPUT_TYPES(cls) -> InputTypeDict:
@@ -196,8 +769,8 @@ class WaitForMilliseconds(ComfyNodeABC):
             }
         }
 
-    RETURN_TYPES = (IO.ANY,)
-    RETURN_NAMES = ("passthrough",)
+    RETURN_TYPES = (IO.ANY, "FLOAT")
+    RETURN_NAMES = ("passthrough", "waited_ms")
     FUNCTION = "wait"
     CATEGORY = "SGNodes/Utilities"
 
@@ -205,9 +778,88 @@ class WaitForMilliseconds(ComfyNodeABC):
         if passthrough is None:
             return ["passthrough"]
 
-    def wait(self, milliseconds, passthrough=None):
-        time.sleep(milliseconds / 1000.0)
-        return (passthrough,)
+    async def wait(self, milliseconds, passthrough=None):
+        start = time.perf_counter()
+        await interruptible_sleep(milliseconds / 1000.0)
+        return (passthrough, (time.perf_counter() - start) * 1000.0)
+
+
+# Shared HTTP session for the network nodes. urllib3 keeps a keep-alive
+# connection pool per host inside the session, so repeated calls to the same
+# backend reuse connections across node executions and prompts.
+_http_session_lock = threading.Lock()
+_http_session: Optional[requests.Session] = None
+_http_session_policy: Optional[Tuple] = None
+
+def _create_http_session(settings: SGNodesSettings) -> requests.Session:
+    retry = Retry(
+        total=settings.http_max_retries,
+        backoff_factor=settings.http_backoff_factor,
+        status_forcelist=settings.http_retry_statuses,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=settings.http_pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Don't carry cookies from one node execution over to the next
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+def get_http_session() -> requests.Session:
+    """Return the shared pooled session, rebuilding it when the HTTP settings change."""
+    global _http_session, _http_session_policy
+    settings = get_settings()
+    policy = (settings.http_pool_size, settings.http_max_retries,
+              settings.http_backoff_factor, settings.http_retry_statuses)
+    with _http_session_lock:
+        if _http_session is None or _http_session_policy != policy:
+            if _http_session is not None:
+                _http_session.close()
+            _http_session = _create_http_session(settings)
+            _http_session_policy = policy
+        return _http_session
+
+def http_request(method: str, url: str, body: str = "", headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+    """Send a request through the shared pooled session."""
+    return get_http_session().request(method, url, data=body, headers=headers, **kwargs)
+
+# Single-flight for identical concurrent requests: key -> future of the request
+# currently in flight. Only the first caller sends it; callers arriving before
+# it finishes wait for and share its result or exception.
+_http_inflight_lock = threading.Lock()
+_http_inflight: Dict[Any, Future] = {}
+
+def coalesce_request(method: str, key: Any, send: Callable[[], Any]) -> Any:
+    """Run send() once for all concurrent callers with the same key.
+
+    Only methods listed in the http_coalesce_methods setting are coalesced;
+    others always call send() directly. Nothing is kept once the request is
+    done, so later callers send a fresh request.
+    """
+    if method.upper() not in get_settings().http_coalesce_methods:
+        return send()
+
+    with _http_inflight_lock:
+        future = _http_inflight.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _http_inflight[key] = future
+    if not leader:
+        return future.result()
+
+    try:
+        result = send()
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _http_inflight_lock:
+            _http_inflight.pop(key, None)
 
 
 class CallRemoteUrl(ComfyNodeABC):
@@ -222,6 +874,8 @@ class CallRemoteUrl(ComfyNodeABC):
             "optional": {
                 "body": ("STRING", {"multiline": True, "default": ""}),
                 "headers": ("STRING", {"multiline": True, "default": "{}"}),
+                "cache_responses": ("BOOLEAN", {"default": False, "tooltip": "Reuse successful GET/HEAD responses while they are fresh according to Cache-Control/Expires."}),
+                "cache_ttl_seconds": ("FLOAT", {"default": 0.0, "min": 0.0, "max": 31536000.0, "tooltip": "Override the response lifetime in seconds. 0 follows the response headers. no-store responses are never cached."}),
             }
         }
 
@@ -230,20 +884,430 @@ class CallRemoteUrl(ComfyNodeABC):
     FUNCTION = "execute_request"
     CATEGORY = "SGNodes/Network"
 
-    def execute_request(self, url, method, passthrough, body="", headers="{}"):
+    @classmethod
+    def IS_CHANGED(cls, url=None, method=None, body=None, headers=None, cache_responses=False, **kwargs):
+        # ComfyUI only passes widget values here; linked inputs are missing (None)
+        if cache_responses is False:
+            return ""
+        if not isinstance(url, str) or not isinstance(method, str) or not isinstance(body, str) or not isinstance(headers, str):
+            return float("nan")  # Can't tell which response applies: run again
+        if method.upper() not in HTTP_CACHE_METHODS:
+            return ""
+        entry = get_cached_response(http_cache_key(method, url, body, headers))
+        if entry is None:
+            return float("nan")  # Missing or expired: run again
+        return entry[1]  # Stable while the cached response is fresh
+
+    def execute_request(self, url, method, passthrough, body="", headers="{}", cache_responses=False, cache_ttl_seconds=0.0):
+        status_code, response_body = call_remote_url(method, url, body, headers, cache_responses, cache_ttl_seconds)
+        return (passthrough, status_code, response_body)
+
+
+# Opt-in response cache for CallRemoteUrl: key -> (expires_at, stored_at, status, text).
+# Only successful GET/HEAD responses are kept.
+HTTP_CACHE_MAX_ITEMS = 128
+HTTP_CACHE_MAX_CHARS = 32 * 1024 * 1024
+HTTP_CACHE_METHODS = ("GET", "HEAD")
+_http_cache_lock = threading.Lock()
+_http_cache: "OrderedDict[Tuple[str, str, str, str], Tuple[float, float, int, str]]" = OrderedDict()
+_http_cache_chars = 0
+
+def _parse_headers(headers: str) -> Dict[str, Any]:
+    try:
+        headers_json = json.loads(headers)
+    except:
+        headers_json = {}
+    return headers_json if isinstance(headers_json, dict) else {}
+
+def http_cache_key(method: str, url: str, body: str = "", headers: str = "{}") -> Tuple[str, str, str, str]:
+    """Cache key for a request; header order and JSON formatting don't matter."""
+    return (method.upper(), url, json.dumps(_parse_headers(headers), sort_keys=True), body or "")
+
+def response_freshness(response: requests.Response, now: float) -> Optional[float]:
+    """Seconds a response may be reused per Cache-Control/Expires, or None if not cacheable."""
+    cache_control = {}
+    for directive in response.headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            cache_control[name.lower()] = value.strip().strip('"')
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0.0
+    if "max-age" in cache_control:
         try:
+            return max(0.0, float(cache_control["max-age"]))
+        except ValueError:
+            return 0.0
+    expires = response.headers.get("Expires")
+    if expires:
+        try:
+            expires_at = email.utils.parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError):
+            return 0.0  # Invalid dates mean "already expired"
+        date = response.headers.get("Date")
+        try:
+            served_at = email.utils.parsedate_to_datetime(date).timestamp() if date else now
+        except (TypeError, ValueError):
+            served_at = now
+        return max(0.0, expires_at - served_at)
+    return None
+
+def get_cached_response(key: Tuple[str, str, str, str]) -> Optional[Tuple[float, float, int, str]]:
+    """Return the fresh cache entry for key, dropping it if it expired."""
+    global _http_cache_chars
+    with _http_cache_lock:
+        entry = _http_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del _http_cache[key]
+            _http_cache_chars -= len(entry[3])
+            return None
+        _http_cache.move_to_end(key)
+        return entry
+
+def _store_cached_response(key: Tuple[str, str, str, str], ttl: float, status_code: int, text: str) -> None:
+    global _http_cache_chars
+    now = time.time()
+    with _http_cache_lock:
+        previous = _http_cache.pop(key, None)
+        if previous is not None:
+            _http_cache_chars -= len(previous[3])
+        _http_cache[key] = (now + ttl, now, status_code, text)
+        _http_cache_chars += len(text)
+        while len(_http_cache) > 1 and (len(_http_cache) > HTTP_CACHE_MAX_ITEMS or _http_cache_chars > HTTP_CACHE_MAX_CHARS):
+            _, evicted = _http_cache.popitem(last=False)
+            _http_cache_chars -= len(evicted[3])
+
+def call_remote_url(method: str, url: str, body: str = "", headers: str = "{}",
+                    cache: bool = False, cache_ttl_seconds: float = 0.0,
+                    slot: Optional[threading.Semaphore] = None) -> Tuple[int, str]:
+    """Send one CallRemoteUrl request; failures are reported as status 500.
+
+    With cache=True, successful GET/HEAD responses are reused while fresh. The
+    lifetime comes from Cache-Control/Expires, or from cache_ttl_seconds when
+    it is > 0. Responses marked no-store are never cached. slot, if given, is
+    held only while the request is actually being sent.
+    """
+    key = http_cache_key(method, url, body, headers)
+    cacheable = cache and key[0] in HTTP_CACHE_METHODS
+    if cacheable:
+        entry = get_cached_response(key)
+        if entry is not None:
+            return (entry[2], entry[3])
+
+    # Identical concurrent requests share one response
+    return coalesce_request(method, ("call", cacheable, cache_ttl_seconds) + key,
+                            lambda: _send_remote_url(method, url, body, headers, key if cacheable else None, cache_ttl_seconds, slot))
+
+def _send_remote_url(method: str, url: str, body: str, headers: str,
+                     cache_key: Optional[Tuple[str, str, str, str]], cache_ttl_seconds: float,
+                     slot: Optional[threading.Semaphore]) -> Tuple[int, str]:
+    try:
+        with slot or contextlib.nullcontext():
+            response = http_request(method, url, body, _parse_headers(headers))
+
+        if cache_key is not None and 200 <= response.status_code < 300:
+            if cache_ttl_seconds > 0:
+                no_store = "no-store" in response.headers.get("Cache-Control", "").lower()
+                ttl = None if no_store else cache_ttl_seconds
+            else:
+                ttl = response_freshness(response, time.time())
+            if ttl:
+                _store_cached_response(cache_key, ttl, response.status_code, response.text)
+
+        return (response.status_code, response.text)
+
+    except Exception as e:
+        return (500, f"Error: {str(e)}")
+
+
+class CallRemoteUrlBatch(ComfyNodeABC):
+    @classmethod
+    def INPUT_TYPES(cls) -> InputTypeDict:
+        return {
+            "required": {
+                "url": ("STRING", {"default": ""}),
+                "method": (["GET", "POST", "PUT", "DELETE", "HEAD", "PATCH"],),
+                "passthrough": (IO.ANY, {}),
+                "max_concurrency": ("INT", {"default": 16, "min": 1, "max": 256, "tooltip": "Maximum number of requests in flight at once."}),
+                "per_host_limit": ("INT", {"default": 0, "min": 0, "max": 256, "tooltip": "Maximum number of requests in flight per host. 0 uses the connection pool size (http_pool_size)."}),
+            },
+            "optional": {
+                "body": ("STRING", {"multiline": True, "default": ""}),
+                "headers": ("STRING", {"multiline": True, "default": "{}"}),
+            }
+        }
+
+    INPUT_IS_LIST = True
+    RETURN_TYPES = (IO.ANY, "INT", "STRING")
+    RETURN_NAMES = ("passthrough", "status_code", "response_body")
+    OUTPUT_IS_LIST = (True, True, True)
+    FUNCTION = "execute_requests"
+    CATEGORY = "SGNodes/Network"
+
+    async def execute_requests(self, url, method, passthrough, max_concurrency, per_host_limit, body=None, headers=None):
+        body = body or [""]
+        headers = headers or ["{}"]
+        columns = (url, method, body, headers, passthrough)
+        if any(len(column) == 0 for column in columns):
+            return ([], [], [])  # An empty list input means there is nothing to send
+        count = max(len(column) for column in columns)
+        # Inputs with a single value apply to every request
+        for column in columns:
+            if len(column) not in (1, count):
+                raise ValueError(f"CallRemoteUrlBatch: list inputs must have 1 or {count} items, got {len(column)}")
+        pick = lambda column, i: column[i] if len(column) > 1 else column[0]
+
+        host_limit = per_host_limit[0] or get_settings().http_pool_size
+        host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        for i in range(count):
+            host = requests.utils.urlparse(pick(url, i)).netloc
+            host_slots.setdefault(host, threading.BoundedSemaphore(host_limit))
+
+        def send(i: int) -> Tuple[int, str]:
+            if comfy.model_management.processing_interrupted():
+                return (500, "Error: interrupted")
+            request_url = pick(url, i)
+            slot = host_slots[requests.utils.urlparse(request_url).netloc]
+            return call_remote_url(pick(method, i), request_url, pick(body, i), pick(headers, i), slot=slot)
+
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=min(max_concurrency[0], count), thread_name_prefix="sg-nodes-http") as executor:
+            results = await asyncio.gather(*(loop.run_in_executor(executor, send, i) for i in range(count)))
+        comfy.model_management.throw_exception_if_processing_interrupted()
+
+        return (
+            [pick(passthrough, i) for i in range(count)],
+            [status for status, _ in results],
+            [text for _, text in results],
+        )
+
+
+_JSON_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+def is_json_subset(subset, superset) -> bool:
+    """Structural partial match: every key/item in subset must be present in superset."""
+    if isinstance(subset, dict):
+        return isinstance(superset, dict) and all(key in superset and is_json_subset(val, superset[key]) for key, val in subset.items())
+    elif isinstance(subset, list):
+        if not isinstance(superset, list):
+            return False
+        # Scalar items are looked up in a set built once per list instead of
+        # scanning the superset for each item; set membership uses the same
+        # equality as ==, so results are unchanged.
+        superset_scalars = None
+        for item in subset:
+            if isinstance(item, _JSON_SCALAR_TYPES):
+                if superset_scalars is None:
+                    superset_scalars = {s for s in superset if isinstance(s, _JSON_SCALAR_TYPES)}
+                if item not in superset_scalars:
+                    return False
+            elif not any(is_json_subset(item, super_item) for super_item in superset):
+                return False
+        return True
+    else:
+        return subset == superset
+
+@functools.lru_cache(maxsize=128)
+def _compile_match_pattern(match_value: str) -> Optional["re.Pattern"]:
+    try:
+        return re.compile(match_value)
+    except re.error:
+        print(f"Invalid regex pattern: {match_value}")
+        return None
+
+@functools.lru_cache(maxsize=128)
+def compile_matcher(match_type: str, match_value: str) -> Callable[[str], bool]:
+    """Build a response matcher once per (match_type, match_value) and cache it."""
+    if match_type == "string":
+        return lambda response_text: match_value in response_text
+
+    elif match_type == "regex":
+        pattern = _compile_match_pattern(match_value)
+        if pattern is None:
+            return lambda response_text: False
+        return lambda response_text: bool(pattern.search(response_text))
+
+    elif match_type == "json":
+        try:
+            target_json = json.loads(match_value)
+        except json.JSONDecodeError:
+            return lambda response_text: False
+
+        def match_json(response_text):
             try:
-                headers_json = json.loads(headers)
-            except:
-                headers_json = {}
+                response_json = json.loads(response_text)
+            except json.JSONDecodeError:
+                return False
+            return is_json_subset(target_json, response_json)
+        return match_json
+
+    return lambda response_text: False
+
+
+# Characters of already-seen text kept between chunks for regex matching, so
+# matches spanning a chunk boundary are found. Longer matches may be missed.
+STREAM_REGEX_OVERLAP = 65536
+
+class StreamingMatcher:
+    """Incremental string/regex matcher fed with decoded response chunks.
+
+    json matching needs the whole document, so it is buffered and decided in finish().
+    """
+
+    def __init__(self, match_type: str, match_value: str):
+        self.match_type = match_type
+        self.match_value = match_value
+        self.pattern = _compile_match_pattern(match_value) if match_type == "regex" else None
+        self.window = ""
+        self.search_start = 0
+        self.chunks: List[str] = []
+
+    def feed(self, text: str) -> bool:
+        """Add a chunk; returns True as soon as a match is certain."""
+        if self.match_type == "string":
+            window = self.window + text
+            if self.match_value in window:
+                return True
+            # Keep just enough tail to catch a match spanning the boundary
+            keep = len(self.match_value) - 1
+            self.window = window[-keep:] if keep > 0 else ""
+            return False
+
+        elif self.match_type == "regex":
+            if self.pattern is None:
+                return False
+            self.window += text
+            match = self.pattern.search(self.window, self.search_start)
+            # A match touching the end of the window could still grow or be a
+            # false '$', so it is only accepted once more text follows it
+            if match and match.end() < len(self.window):
+                return True
+            if len(self.window) > STREAM_REGEX_OVERLAP + 1:
+                # One extra leading char keeps '^' and lookbehinds from
+                # treating the cut point as the start of the document
+                self.window = self.window[-(STREAM_REGEX_OVERLAP + 1):]
+                self.search_start = 1
+            return False
+
+        elif self.match_type == "json":
+            self.chunks.append(text)
+        return False
 
-            response = requests.request(method, url, data=body, headers=headers_json)
-            
-            return (passthrough, response.status_code, response.text)
-            
-        except Exception as e:
-            return (passthrough, 500, f"Error: {str(e)}")
+    def finish(self) -> bool:
+        """Decide the match once the whole response has been fed."""
+        if self.match_type == "regex":
+            return self.pattern is not None and bool(self.pattern.search(self.window, self.search_start))
+        elif self.match_type == "json":
+            return compile_matcher(self.match_type, self.match_value)("".join(self.chunks))
+        return False
 
+def _truncate_body(text: str, max_body_bytes: int) -> str:
+    if max_body_bytes <= 0 or len(text) <= max_body_bytes // 4:
+        return text
+    encoded = text.encode('utf-8')
+    if len(encoded) <= max_body_bytes:
+        return text
+    return encoded[:max_body_bytes].decode('utf-8', errors='ignore')
+
+class PollAttempt(NamedTuple):
+    """Result of one poll request, plus the validators used for the next one."""
+    status_code: int
+    body: str
+    is_match: bool
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+
+def _conditional_headers(headers: Dict[str, str], previous: Optional[PollAttempt]) -> Dict[str, str]:
+    """Add If-None-Match/If-Modified-Since from the previous attempt unless the user set them."""
+    if previous is None or not (previous.etag or previous.last_modified):
+        return headers
+    present = {k.lower() for k in headers}
+    headers = dict(headers)
+    if previous.etag and "if-none-match" not in present:
+        headers["If-None-Match"] = previous.etag
+    if previous.last_modified and "if-modified-since" not in present:
+        headers["If-Modified-Since"] = previous.last_modified
+    return headers
+
+def fetch_and_match(method: str, url: str, body: str, headers: Dict[str, str], match_type: str, match_value: str,
+                    timeout: Optional[float] = None, stream: bool = False, max_body_bytes: int = 0,
+                    previous: Optional[PollAttempt] = None, conditional: bool = True) -> PollAttempt:
+    """Perform one poll request and match its body.
+
+    In stream mode the body is read in chunks and the download stops as soon as
+    a match is found. max_body_bytes (0 = unlimited) caps the body kept for the
+    output. With conditional=True the previous attempt's ETag/Last-Modified are
+    sent, and a 304 or an identical body hash reuses the previous result
+    without matching again.
+
+    Identical concurrent polls share one request. The key covers everything
+    the result depends on, including the timeout and the previous attempt.
+    """
+    if conditional:
+        headers = _conditional_headers(headers, previous)
+    key = ("poll", method.upper(), url, body or "", json.dumps(headers or {}, sort_keys=True, default=str),
+           match_type, match_value, timeout, stream, max_body_bytes, conditional, previous)
+    return coalesce_request(method, key, lambda: _fetch_and_match(
+        method, url, body, headers, match_type, match_value, timeout, stream, max_body_bytes, previous, conditional))
+
+def _fetch_and_match(method: str, url: str, body: str, headers: Optional[Dict[str, str]], match_type: str, match_value: str,
+                     timeout: Optional[float], stream: bool, max_body_bytes: int,
+                     previous: Optional[PollAttempt], conditional: bool) -> PollAttempt:
+    response = http_request(method, url, body, headers, timeout=timeout, stream=stream)
+    try:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if conditional and previous is not None and response.status_code == 304:
+            # Unchanged since the previous attempt
+            return previous._replace(etag=etag or previous.etag, last_modified=last_modified or previous.last_modified)
+
+        if not stream:
+            content = response.content
+            content_hash = hashlib.blake2b(content, digest_size=16).hexdigest()
+            if conditional and previous is not None and content_hash == previous.content_hash:
+                return previous._replace(status_code=response.status_code, etag=etag, last_modified=last_modified)
+            text = response.text
+            is_match = compile_matcher(match_type, match_value)(text)
+            return PollAttempt(response.status_code, _truncate_body(text, max_body_bytes), is_match, etag, last_modified, content_hash)
+
+        encoding = response.encoding or 'utf-8'
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        except LookupError:
+            encoding = 'utf-8'
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        matcher = StreamingMatcher(match_type, match_value)
+        hasher = hashlib.blake2b(digest_size=16)
+        retained = bytearray()
+        is_match = None
+        for chunk in response.iter_content(chunk_size=65536):
+            hasher.update(chunk)
+            if max_body_bytes <= 0:
+                retained += chunk
+            elif len(retained) < max_body_bytes:
+                retained += chunk[:max_body_bytes - len(retained)]
+            if matcher.feed(decoder.decode(chunk)):
+                is_match = True
+                break
+    finally:
+        # Closing an unfinished stream drops the connection instead of draining it
+        response.close()
+
+    content_hash = None
+    if is_match is None:
+        # The whole body was read, so its hash is complete
+        content_hash = hasher.hexdigest()
+        if conditional and previous is not None and content_hash == previous.content_hash:
+            return previous._replace(status_code=response.status_code, etag=etag, last_modified=last_modified)
+        tail = decoder.decode(b"", final=True)
+        is_match = (matcher.feed(tail) if tail else False) or matcher.finish()
+
+    text = retained.decode(encoding, errors='ignore')
+    return PollAttempt(response.status_code, text, is_match, etag, last_modified, content_hash)
 
 class PollRemoteUrl(ComfyNodeABC):
     @classmethod
@@ -262,6 +1326,14 @@ class PollRemoteUrl(ComfyNodeABC):
                 "headers": ("STRING", {"multiline": True, "default": "{}"}),
                 "max_attempts": ("INT", {"default": 30, "min": 1, "max": 1000}),
                 "delay_ms": ("INT", {"default": 500, "min": 0, "max": 60000}),
+                "timeout_ms": ("INT", {"default": 0, "min": 0, "max": 600000, "tooltip": "Per-request timeout in milliseconds (0 = no timeout)."}),
+                "backoff_factor": ("FLOAT", {"default": 1.0, "min": 1.0, "max": 10.0, "step": 0.1, "tooltip": "Multiplier applied to the delay after each attempt (1.0 = constant delay)."}),
+                "max_delay_ms": ("INT", {"default": 60000, "min": 0, "max": 600000, "tooltip": "Upper bound for the delay between attempts."}),
+                "jitter": ("FLOAT", {"default": 0.0, "min": 0.0, "max": 1.0, "step": 0.05, "tooltip": "Randomize each delay by up to this fraction."}),
+                "deadline_ms": ("INT", {"default": 0, "min": 0, "max": 86400000, "tooltip": "Overall time limit for polling in milliseconds (0 = no limit)."}),
+                "stream_response": ("BOOLEAN", {"default": False, "tooltip": "Read the response in chunks and stop downloading as soon as a string/regex match is found."}),
+                "max_body_bytes": ("INT", {"default": 0, "min": 0, "max": 2**31 - 1, "tooltip": "Maximum bytes of the response kept for the response_body output (0 = unlimited)."}),
+                "conditional_requests": ("BOOLEAN", {"default": True, "tooltip": "Send ETag/Last-Modified validators from the previous attempt and skip matching when the response is unchanged."}),
             }
         }
 
@@ -271,52 +1343,52 @@ class PollRemoteUrl(ComfyNodeABC):
     CATEGORY = "SGNodes/Network"
 
     def check_match(self, response_text, match_type, match_value):
-        if match_type == "string":
-            return match_value in response_text
-        
-        elif match_type == "regex":
-            try:
-                pattern = re.compile(match_value)
-                return bool(pattern.search(response_text))
-            except re.error:
-                print(f"Invalid regex pattern: {match_value}")
-                return False
-                
-        elif match_type == "json":
-            try:
-                response_json = json.loads(response_text)
-                target_json = json.loads(match_value)
-                
-                def is_subset(subset, superset):
-                    if isinstance(subset, dict):
-                        return isinstance(superset, dict) and all(key in superset and is_subset(val, superset[key]) for key, val in subset.items())
-                    elif isinstance(subset, list):
-                        return isinstance(superset, list) and all(any(is_subset(item, super_item) for super_item in superset) for item in subset)
-                    else:
-                        return subset == superset
-                        
-                return is_subset(target_json, response_json)
-            except json.JSONDecodeError:
-                return False
-                
-        return False
-
-    def execute_poll(self, url, method, match_type, match_value, passthrough, invert_match=False, body="", headers="{}", max_attempts=30, delay_ms=500):
+        return compile_matcher(match_type, match_value)(response_text)
+
+    @staticmethod
+    def get_delay(attempt, delay_ms, backoff_factor=1.0, max_delay_ms=60000, jitter=0.0):
+        """Delay in seconds before the next attempt: exponential backoff with optional jitter."""
+        if backoff_factor > 1.0 and delay_ms > 0:
+            # Stop growing once max_delay_ms is reached, so the power can't overflow
+            attempt = min(attempt, math.ceil(math.log(max(max_delay_ms, delay_ms) / delay_ms, backoff_factor)))
+        delay = min(delay_ms * (backoff_factor ** attempt), max_delay_ms) / 1000.0
+        if jitter > 0:
+            delay *= random.uniform(1.0 - jitter, 1.0 + jitter)
+        return delay
+
+    async def execute_poll(self, url, method, match_type, match_value, passthrough, invert_match=False, body="", headers="{}", max_attempts=30, delay_ms=500,
+                           timeout_ms=0, backoff_factor=1.0, max_delay_ms=60000, jitter=0.0, deadline_ms=0,
+                           stream_response=False, max_body_bytes=0, conditional_requests=True):
         try:
             headers_json = json.loads(headers)
         except:
             headers_json = {}
 
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + deadline_ms / 1000.0 if deadline_ms > 0 else None
+
+        # Compile (and report an invalid pattern) once, before the first attempt
+        compile_matcher(match_type, match_value)
+
         last_status = 0
         last_response = ""
+        previous = None
 
         for attempt in range(max_attempts):
+            timeout = timeout_ms / 1000.0 if timeout_ms > 0 else None
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                timeout = min(timeout, remaining) if timeout is not None else remaining
+
             try:
-                response = requests.request(method, url, data=body, headers=headers_json)
-                last_status = response.status_code
-                last_response = response.text
-                
-                is_match = self.check_match(last_response, match_type, match_value)
+                # The blocking request runs in a worker thread so the event loop stays free
+                previous = await run_interruptible(
+                    fetch_and_match, method, url, body, headers_json, match_type, match_value,
+                    timeout=timeout, stream=stream_response, max_body_bytes=max_body_bytes,
+                    previous=previous, conditional=conditional_requests)
+                last_status, last_response, is_match = previous.status_code, previous.body, previous.is_match
                 
                 if invert_match:
                     if not is_match:
@@ -324,44 +1396,165 @@ class PollRemoteUrl(ComfyNodeABC):
                 elif is_match:
                     return (passthrough, last_status, last_response)
                 
+            except comfy.model_management.InterruptProcessingException:
+                raise
             except Exception as e:
-                last_display_error = str(e)
-                # If request fails, we still might want to keep polling or stop?
-                # Usually polling implies waiting for availability, but here we are matching content.
-                # Use standard sleep
-            
-            time.sleep(delay_ms / 1000.0)
-            
+                # Failed attempts (connection errors, timeouts) count as no match
+                pass
+
+            if attempt == max_attempts - 1:
+                break
+
+            delay = self.get_delay(attempt, delay_ms, backoff_factor, max_delay_ms, jitter)
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - loop.time()))
+            await interruptible_sleep(delay)
+
         return (passthrough, last_status, last_response)
 
 
-def get_nested_value(data, path, default=None):
-    """Retrieve a value from a nested dictionary using dot notation."""
-    try:
-        keys = path.split('.')
-        current = data
-        for key in keys:
+# Parsed JSON documents shared by the JSON nodes, so a document that fans out
+# to many nodes is parsed once. Keyed by the JSON text itself: the dict lookup
+# hashes the string once per str object and compares contents on a hash hit.
+# Cached values are shared between nodes and must be treated as read-only.
+JSON_CACHE_MAX_ITEMS = 64
+JSON_CACHE_MAX_CHARS = 64 * 1024 * 1024
+# Smaller documents are cheaper to parse again than to keep around
+JSON_CACHE_MIN_CHARS = 256
+_json_cache_lock = threading.Lock()
+_json_cache: "OrderedDict[str, Any]" = OrderedDict()
+_json_cache_chars = 0
+
+def is_json_cacheable(text: str) -> bool:
+    """Whether the shared JSON cache would keep a document of this size."""
+    return JSON_CACHE_MIN_CHARS <= len(text) <= JSON_CACHE_MAX_CHARS
+
+def _remember_json(text: str, value: Any) -> None:
+    global _json_cache_chars
+    if not is_json_cacheable(text):
+        return
+    with _json_cache_lock:
+        if text in _json_cache:
+            _json_cache.move_to_end(text)
+            return
+        _json_cache[text] = value
+        _json_cache_chars += len(text)
+        while len(_json_cache) > JSON_CACHE_MAX_ITEMS or _json_cache_chars > JSON_CACHE_MAX_CHARS:
+            evicted, _ = _json_cache.popitem(last=False)
+            _json_cache_chars -= len(evicted)
+
+def parse_json_cached(text: str) -> Any:
+    """json.loads through the shared document cache; raises json.JSONDecodeError like json.loads."""
+    with _json_cache_lock:
+        if text in _json_cache:
+            _json_cache.move_to_end(text)
+            return _json_cache[text]
+    value = json.loads(text)
+    _remember_json(text, value)
+    return value
+
+def dumps_json_cached(value: Any) -> str:
+    """json.dumps that also caches the result, so a downstream JSON node doesn't parse it again."""
+    text = json.dumps(value)
+    _remember_json(text, value)
+    return text
+
+def _split_json_path(path: str) -> List[Tuple[str, bool]]:
+    """Split a dot path into (segment, escaped) pairs; a backslash escapes the next character."""
+    segments = []
+    current = []
+    escaped = False
+    i = 0
+    while i < len(path):
+        char = path[i]
+        if char == "\\" and i + 1 < len(path):
+            current.append(path[i + 1])
+            escaped = True
+            i += 2
+            continue
+        if char == ".":
+            segments.append(("".join(current), escaped))
+            current = []
+            escaped = False
+        else:
+            current.append(char)
+        i += 1
+    segments.append(("".join(current), escaped))
+    return segments
+
+def _iter_json_path(current, steps, start):
+    """Yield every value reached by steps[start:], fanning out at wildcards."""
+    for i in range(start, len(steps)):
+        key, index, wildcard = steps[i]
+        if wildcard:
             if isinstance(current, dict):
-                current = current.get(key, default)
+                children = current.values()
             elif isinstance(current, list):
-                # Optional: support list indexing via integers?
+                children = current
+            else:
+                return
+            for child in children:
+                if child is not None:
+                    yield from _iter_json_path(child, steps, i + 1)
+            return
+        if isinstance(current, dict):
+            current = current.get(key)
+        elif isinstance(current, list) and index is not None:
+            try:
+                current = current[index]
+            except IndexError:
+                return
+        else:
+            return
+        if current is None:
+            return
+    yield current
+
+@functools.lru_cache(maxsize=256)
+def compile_json_path(path: str) -> Callable[[Any], Any]:
+    """Compile a dot path into an accessor function, once per path.
+
+    Segments are dict keys or list indices (negative indices count from the
+    end). '*' matches every dict value or list item and makes the accessor
+    return a list of all matches. A backslash escapes dots and '*'.
+    The accessor returns None when the path doesn't resolve, including a
+    wildcard path with no matches.
+    """
+    steps = []
+    for segment, escaped in _split_json_path(path):
+        try:
+            index = int(segment)
+        except ValueError:
+            index = None
+        steps.append((segment, index, segment == "*" and not escaped))
+    steps = tuple(steps)
+
+    if any(wildcard for _, _, wildcard in steps):
+        return lambda data: list(_iter_json_path(data, steps, 0)) or None
+
+    def access(current):
+        for key, index, _ in steps:
+            if isinstance(current, dict):
+                current = current.get(key)
+            elif isinstance(current, list) and index is not None:
                 try:
-                    index = int(key)
-                    if 0 <= index < len(current):
-                         current = current[index]
-                    else:
-                        return default
-                except ValueError:
-                     return default
+                    current = current[index]
+                except IndexError:
+                    return None
             else:
-                return default
-                
+                return None
             if current is None:
-                return default
-                
+                return None
         return current
+    return access
+
+def get_nested_value(data, path, default=None):
+    """Retrieve a value from a nested dictionary using dot notation."""
+    try:
+        value = compile_json_path(path)(data)
     except Exception:
         return default
+    return default if value is None else value
 
 class MapJsonToProperty(ComfyNodeABC):
     @classmethod
@@ -380,7 +1573,7 @@ class MapJsonToProperty(ComfyNodeABC):
 
     def map_to_property(self, json_string, property_name):
         try:
-            data = json.loads(json_string)
+            data = parse_json_cached(json_string)
             if not isinstance(data, (dict, list)): # Allow list as root for index access
                  return ("",)
 
@@ -390,7 +1583,7 @@ class MapJsonToProperty(ComfyNodeABC):
                 return ("",)
 
             if isinstance(value, (dict, list)):
-                return (json.dumps(value),)
+                return (dumps_json_cached(value),)
             
             return (str(value),)
             
@@ -416,23 +1609,125 @@ class MapJsonArray(ComfyNodeABC):
 
     def map_array(self, json_array, property_name):
         try:
-            data = json.loads(json_array)
+            data = parse_json_cached(json_array)
             if not isinstance(data, list):
                 return ("[]",)
 
-            result = []
-            for item in data:
-                 value = get_nested_value(item, property_name)
-                 if value is not None:
-                     result.append(value)
+            # Compile the path once, then apply it to every element
+            accessor = compile_json_path(property_name)
+            result = [value for value in map(accessor, data) if value is not None]
             
-            return (json.dumps(result),)
+            return (dumps_json_cached(result),)
             
         except json.JSONDecodeError:
             return ("[]",)
         except Exception as e:
             return (f"Error: {str(e)}",)
 
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# Documents FindJsonElement has streamed once, by (length, str hash). Seeing
+# one again means several nodes search it, so it is parsed into the shared
+# cache instead. Only the fingerprint is kept, not the text; a collision just
+# picks the other search strategy.
+_json_streamed: "OrderedDict[Tuple[int, int], None]" = OrderedDict()
+
+def is_json_cached(text: str) -> bool:
+    with _json_cache_lock:
+        return text in _json_cache
+
+def _mark_json_streamed(text: str) -> bool:
+    """Remember that text was streamed; returns True if it already was."""
+    key = (len(text), hash(text))
+    with _json_cache_lock:
+        if key in _json_streamed:
+            _json_streamed.move_to_end(key)
+            return True
+        _json_streamed[key] = None
+        while len(_json_streamed) > JSON_CACHE_MAX_ITEMS:
+            _json_streamed.popitem(last=False)
+        return False
+
+def iter_json_array(text: str) -> Iterator[Any]:
+    """Decode a JSON array one element at a time.
+
+    Elements after the point where the caller stops iterating are never
+    decoded. Raises ValueError right away when the document isn't an array,
+    and json.JSONDecodeError during iteration for malformed input.
+    """
+    idx = _JSON_WHITESPACE.match(text, 0).end()
+    if not text.startswith("[", idx):
+        raise ValueError("JSON document is not an array")
+    return _iter_json_array_items(text, idx + 1)
+
+def _iter_json_array_items(text: str, idx: int) -> Iterator[Any]:
+    idx = _JSON_WHITESPACE.match(text, idx).end()
+    if not text.startswith("]", idx):
+        while True:
+            item, idx = _JSON_DECODER.raw_decode(text, idx)
+            yield item
+            idx = _JSON_WHITESPACE.match(text, idx).end()
+            if text.startswith(",", idx):
+                idx = _JSON_WHITESPACE.match(text, idx + 1).end()
+            elif text.startswith("]", idx):
+                break
+            else:
+                raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+    # Same as json.loads: nothing but whitespace may follow the array
+    end = _JSON_WHITESPACE.match(text, idx + 1).end()
+    if end != len(text):
+        raise json.JSONDecodeError("Extra data", text, end)
+
+# Lookup indexes for FindJsonElement: (json text, match_key) -> {str(value): [elements]}.
+# Building one costs a single pass; every lookup after that is a dict hit.
+# Bounded by the size of the indexed documents as well, since each entry
+# keeps its document text and elements alive.
+JSON_INDEX_MAX_ITEMS = 32
+JSON_INDEX_MAX_CHARS = 64 * 1024 * 1024
+_json_index_lock = threading.Lock()
+_json_index_cache: "OrderedDict[Tuple[str, str], Dict[str, List[Any]]]" = OrderedDict()
+_json_index_chars = 0
+
+def get_json_index(json_array: str, match_key: str, build: bool = True) -> Optional[Dict[str, List[Any]]]:
+    """Index the elements of a JSON array by the stringified value at match_key.
+
+    Returns None when the document isn't an array, or when build=False and no
+    index exists yet. Raises json.JSONDecodeError for malformed input.
+    """
+    global _json_index_chars
+    key = (json_array, match_key)
+    with _json_index_lock:
+        index = _json_index_cache.get(key)
+        if index is not None:
+            _json_index_cache.move_to_end(key)
+            return index
+    if not build:
+        return None
+
+    data = parse_json_cached(json_array)
+    if not isinstance(data, list):
+        return None
+    accessor = compile_json_path(match_key)
+    index = {}
+    for item in data:
+        val = accessor(item)
+        if val is not None:
+            index.setdefault(str(val), []).append(item)
+
+    if len(json_array) > JSON_INDEX_MAX_CHARS:
+        return index  # Too large to keep
+
+    with _json_index_lock:
+        if key not in _json_index_cache:
+            _json_index_chars += len(json_array)
+        _json_index_cache[key] = index
+        _json_index_cache.move_to_end(key)
+        while len(_json_index_cache) > JSON_INDEX_MAX_ITEMS or _json_index_chars > JSON_INDEX_MAX_CHARS:
+            (evicted, _), _ = _json_index_cache.popitem(last=False)
+            _json_index_chars -= len(evicted)
+    return index
+
 class FindJsonElement(ComfyNodeABC):
     @classmethod
     def INPUT_TYPES(cls) -> InputTypeDict:
@@ -441,6 +1736,9 @@ class FindJsonElement(ComfyNodeABC):
                 "json_array": ("STRING", {"multiline": True, "default": "[]"}),
                 "match_key": ("STRING", {"default": ""}),
                 "match_value": ("STRING", {"default": ""}),
+            },
+            "optional": {
+                "search_mode": (["auto", "full", "streaming", "indexed"], {"default": "auto", "tooltip": "full parses the whole array; streaming decodes elements one at a time and stops at the first match; indexed builds a reusable lookup table for many searches on the same array; auto picks an existing index, then the parsed document, then streaming."}),
             }
         }
 
@@ -449,19 +1747,55 @@ class FindJsonElement(ComfyNodeABC):
     FUNCTION = "find_element"
     CATEGORY = "SGNodes/JSON"
 
-    def find_element(self, json_array, match_key, match_value):
+    def find_element(self, json_array, match_key, match_value, search_mode="auto"):
         try:
-            data = json.loads(json_array)
-            if not isinstance(data, list):
-                 return ("",)
-
-            for item in data:
-                val = get_nested_value(item, match_key)
+            if search_mode == "indexed" or search_mode == "auto":
+                index = get_json_index(json_array, match_key, build=search_mode == "indexed")
+                if index is not None:
+                    matches = index.get(str(match_value))
+                    return (dumps_json_cached(matches[0]),) if matches else ("",)
+                if search_mode == "indexed":
+                    return ("",)  # Not an array
+
+            collected = None
+            if search_mode == "auto":
+                # Stream a document the first time; parse it into the shared
+                # cache once it shows up again, so it's decoded once per prompt.
+                # Documents the cache won't keep are always streamed.
+                if is_json_cached(json_array):
+                    search_mode = "full"
+                elif not is_json_cacheable(json_array):
+                    search_mode = "streaming"
+                elif _mark_json_streamed(json_array):
+                    search_mode = "full"
+                else:
+                    search_mode = "streaming"
+                    collected = []
+
+            if search_mode == "streaming":
+                try:
+                    items = iter_json_array(json_array)
+                except ValueError:
+                    return ("",)
+            else:
+                items = parse_json_cached(json_array)
+                if not isinstance(items, list):
+                     return ("",)
+
+            accessor = compile_json_path(match_key)
+            target = str(match_value)
+            for item in items:
+                if collected is not None:
+                    collected.append(item)
+                val = accessor(item)
                 if val is not None:
                     # Compare as strings to be robust
-                    if str(val) == str(match_value):
-                        return (json.dumps(item),)
-                            
+                    if str(val) == target:
+                        return (dumps_json_cached(item),)
+
+            if collected is not None:
+                # The whole array was decoded anyway, so share it with the other JSON nodes
+                _remember_json(json_array, collected)
             return ("",)
 
         except json.JSONDecodeError:
@@ -469,6 +1803,336 @@ class FindJsonElement(ComfyNodeABC):
         except Exception as e:
             return (f"Error: {str(e)}",)
 
+class FindJsonElements(ComfyNodeABC):
+    @classmethod
+    def INPUT_TYPES(cls) -> InputTypeDict:
+        return {
+            "required": {
+                "json_array": ("STRING", {"multiline": True, "default": "[]"}),
+                "match_key": ("STRING", {"default": ""}),
+                "match_values": ("STRING", {"multiline": True, "default": "", "tooltip": "JSON array of values, or one value per line."}),
+            }
+        }
+
+    RETURN_TYPES = ("STRING",)
+    RETURN_NAMES = ("found_elements",)
+    FUNCTION = "find_elements"
+    CATEGORY = "SGNodes/JSON"
+
+    def find_elements(self, json_array, match_key, match_values):
+        try:
+            try:
+                values = parse_json_cached(match_values)
+                if not isinstance(values, list):
+                    values = [values]
+            except json.JSONDecodeError:
+                values = [line.strip() for line in match_values.splitlines() if line.strip()]
+
+            # One pass over the array builds the index, then each value is a lookup
+            index = get_json_index(json_array, match_key)
+            if index is None:
+                return ("[]",)
+
+            results = []
+            for value in values:
+                matches = index.get(str(value))
+                results.append(matches[0] if matches else None)
+            return (dumps_json_cached(results),)
+
+        except json.JSONDecodeError:
+            return ("[]",)
+        except Exception as e:
+            return (f"Error: {str(e)}",)
+
+# Per-folder listing cache for /sg-nodes/list_files. Listings are trusted for
+# a short time, then revalidated by re-walking the tree, which only re-lists
+# directories whose mtime changed (see _list_directory).
+LIST_FILES_REVALIDATE_SECONDS = 2.0
+LIST_FILES_CACHE_SIZE = 16
+_folder_listing_lock = threading.Lock()
+_folder_listing_cache: "OrderedDict[str, Tuple[float, List[Tuple[str, Tuple[str, ...]]]]]" = OrderedDict()
+# folder -> in-flight listing future, so concurrent requests share one walk
+_folder_listing_inflight: Dict[str, "asyncio.Future"] = {}
+
+def get_folder_listing(folder_path: str) -> Optional[List[Tuple[str, Tuple[str, ...]]]]:
+    """Return (relative dir, file names) pairs for every directory under folder_path."""
+    # Folders kept up to date by the background indexer are served without touching the disk
+    indexer = get_file_indexer()
+    if indexer is not None:
+        entries = indexer.get_listing(folder_path)
+        if entries is not None:
+            return entries
+
+    now = time.monotonic()
+    with _folder_listing_lock:
+        cached = _folder_listing_cache.get(folder_path)
+        if cached is not None and now - cached[0] < LIST_FILES_REVALIDATE_SECONDS:
+            _folder_listing_cache.move_to_end(folder_path)
+            return cached[1]
+
+    walk = _walk_directory_tree(folder_path)
+    if walk is None:
+        return None
+    entries = walk[0]
+
+    with _folder_listing_lock:
+        _folder_listing_cache[folder_path] = (now, entries)
+        _folder_listing_cache.move_to_end(folder_path)
+        while len(_folder_listing_cache) > LIST_FILES_CACHE_SIZE:
+            _folder_listing_cache.popitem(last=False)
+    return entries
+
+async def get_folder_listing_async(folder_path: str) -> Optional[List[Tuple[str, Tuple[str, ...]]]]:
+    """Run get_folder_listing in the executor, sharing one walk between concurrent callers."""
+    future = _folder_listing_inflight.get(folder_path)
+    if future is None:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, get_folder_listing, folder_path)
+        _folder_listing_inflight[folder_path] = future
+        future.add_done_callback(lambda _: _folder_listing_inflight.pop(folder_path, None))
+    # Shielded so one cancelled request doesn't cancel the walk for the others
+    return await asyncio.shield(future)
+
+def _compile_glob(pattern: str) -> "re.Pattern":
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+
+# Optional persistent file index for SelectFileFromFolder (config key
+# file_index_enabled). Directory listings of registered folders are stored in
+# SQLite and loaded at startup, and a background thread keeps them current by
+# re-walking the folders, which only re-lists directories whose mtime changed.
+FILE_INDEX_DB = os.path.join(os.path.dirname(__file__), 'file_index.sqlite3')
+
+class FileIndexer:
+    """Background indexer keeping folder listings current and persisted."""
+
+    def __init__(self, db_path: str, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._roots: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = {}
+        # root -> monotonic time its listing was last checked against the disk
+        self._listed_at: Dict[str, float] = {}
+        # root -> {relative dir: files}, for membership checks
+        self._files_by_dir: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        self._persisted: Dict[str, int] = {}
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS roots (path TEXT PRIMARY KEY)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS directories (path TEXT PRIMARY KEY, mtime_ns INTEGER, "
+                         "dev INTEGER, ino INTEGER, files TEXT, dirs TEXT)")
+        self._db.commit()
+        self._load()
+        self._thread = threading.Thread(target=self._run, name="sg-nodes-file-index", daemon=True)
+        self._thread.start()
+
+    def _load(self) -> None:
+        """Prime the directory listing cache from the database, without touching the folders."""
+        for path, mtime_ns, dev, ino, files, dirs in self._db.execute("SELECT * FROM directories"):
+            _put_dir_listing(path, False, (mtime_ns, (dev, ino), tuple(json.loads(files)), tuple(json.loads(dirs))), replace=False)
+            self._persisted[path] = mtime_ns
+        for (root,) in self._db.execute("SELECT path FROM roots").fetchall():
+            self._roots[root] = None
+            walk = _walk_directory_tree(root, revalidate=False)
+            # Loaded listings are unchecked until the first refresh
+            self._set_listing(root, walk[0] if walk is not None else [], checked_at=0.0)
+
+    def _set_listing(self, root: str, entries: List[Tuple[str, Tuple[str, ...]]], checked_at: Optional[float] = None) -> None:
+        with self._lock:
+            if root not in self._roots:
+                return  # Removed from file_index_folders meanwhile
+            self._roots[root] = entries
+            self._listed_at[root] = time.monotonic() if checked_at is None else checked_at
+            self._files_by_dir[root] = {rel_dir.replace("\\", "/"): files for rel_dir, files in entries}
+
+    def set_roots(self, folders: Tuple[str, ...]) -> None:
+        """Index exactly these folders; new ones get their first walk on the indexer thread."""
+        roots = {os.path.normpath(folder) for folder in folders}
+        with self._lock:
+            if roots == self._roots.keys():
+                return
+            for root in [r for r in self._roots if r not in roots]:
+                del self._roots[root]
+                self._files_by_dir.pop(root, None)
+                self._listed_at.pop(root, None)
+                self._db.execute("DELETE FROM roots WHERE path = ?", (root,))
+            for root in roots - self._roots.keys():
+                self._roots[root] = None
+                self._db.execute("INSERT OR IGNORE INTO roots (path) VALUES (?)", (root,))
+            self._db.commit()
+        self._wake.set()
+
+    def get_listing(self, folder_path: str) -> Optional[List[Tuple[str, Tuple[str, ...]]]]:
+        """Indexed listing of a registered folder, or None if it isn't indexed yet.
+
+        Always answers from memory. A listing older than
+        LIST_FILES_REVALIDATE_SECONDS wakes the indexer thread to revalidate
+        it in the background.
+        """
+        root = os.path.normpath(folder_path)
+        with self._lock:
+            entries = self._roots.get(root)
+            stale = entries is not None and time.monotonic() - self._listed_at.get(root, 0.0) >= LIST_FILES_REVALIDATE_SECONDS
+        if stale:
+            self._wake.set()
+        return entries
+
+    def contains(self, folder_path: str, relative_path: str) -> Optional[bool]:
+        """Whether the index knows relative_path under folder_path; None if the folder isn't indexed."""
+        with self._lock:
+            files_by_dir = self._files_by_dir.get(os.path.normpath(folder_path))
+        if files_by_dir is None:
+            return None
+        rel_dir, _, name = relative_path.replace("\\", "/").rpartition("/")
+        return name in files_by_dir.get(rel_dir, ())
+
+    def refresh(self) -> None:
+        """Re-walk every registered folder and persist directories that changed."""
+        with self._lock:
+            roots = list(self._roots)
+        visited = {}
+        for root in roots:
+            walk = _walk_directory_tree(root)
+            self._set_listing(root, walk[0] if walk is not None else [])
+            if walk is not None:
+                visited.update(walk[1])
+
+        with self._lock:
+            for path, mtime_ns in visited.items():
+                if self._persisted.get(path) == mtime_ns:
+                    continue
+                listing = _get_dir_listing(path, False)
+                if listing is None:
+                    continue
+                self._db.execute("INSERT OR REPLACE INTO directories VALUES (?, ?, ?, ?, ?, ?)",
+                                 (path, listing[0], listing[1][0], listing[1][1], json.dumps(listing[2]), json.dumps(listing[3])))
+                self._persisted[path] = mtime_ns
+            # Forget directories that no longer exist under any registered folder
+            for path in [p for p in self._persisted if p not in visited]:
+                self._db.execute("DELETE FROM directories WHERE path = ?", (path,))
+                del self._persisted[path]
+            self._db.commit()
+
+    def _run(self) -> None:
+        while True:
+            # Cleared first, so a request arriving during a refresh triggers another one
+            self._wake.clear()
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing file index: {e}")
+            self._wake.wait(self.interval_seconds)
+
+_file_indexer: Optional[FileIndexer] = None
+_file_indexer_lock = threading.Lock()
+
+def get_file_indexer() -> Optional[FileIndexer]:
+    """Return the background file indexer, or None when file_index_enabled is off."""
+    global _file_indexer
+    settings = get_settings()
+    if not settings.file_index_enabled:
+        return None
+    with _file_indexer_lock:
+        if _file_indexer is None:
+            try:
+                _file_indexer = FileIndexer(FILE_INDEX_DB, settings.file_index_interval_seconds)
+            except sqlite3.Error as e:
+                print(f"Failed to open file index: {e}")
+                return None
+        _file_indexer.interval_seconds = settings.file_index_interval_seconds
+    _file_indexer.set_roots(settings.file_index_folders)
+    return _file_indexer
+
+class FileFilter:
+    """Extension, contains/regex/glob and exclude filters, compiled once per request.
+
+    Raises ValueError for an invalid regex, so it is reported once instead of
+    being skipped for every file.
+    """
+
+    def __init__(self, extensions: str = "", filter_type: str = "none", filter_text: str = "", exclude: str = ""):
+        # Plain extensions become one lowercased endswith() tuple; entries with
+        # glob characters are matched against the file name; '*' matches all
+        self.extensions: Optional[Tuple[str, ...]] = None
+        self.extension_globs: List["re.Pattern"] = []
+        ext_list = [e.strip().lower() for e in extensions.split(",") if e.strip()]
+        if ext_list and "*" not in ext_list:
+            plain = []
+            for ext in ext_list:
+                if any(c in ext for c in "*?["):
+                    self.extension_globs.append(_compile_glob(ext))
+                else:
+                    # Ensure they start with dot
+                    plain.append(ext if ext.startswith(".") else f".{ext}")
+            self.extensions = tuple(plain)
+
+        self.contains: Optional[str] = None
+        self.regex: Optional["re.Pattern"] = None
+        self.glob: Optional["re.Pattern"] = None
+        self.glob_on_path = False
+        if filter_text:
+            if filter_type == "contains":
+                self.contains = filter_text.lower()
+            elif filter_type == "regex":
+                try:
+                    self.regex = re.compile(filter_text, re.IGNORECASE)
+                except re.error as e:
+                    raise ValueError(f"Invalid regex '{filter_text}': {e}")
+            elif filter_type == "glob":
+                self.glob = _compile_glob(filter_text)
+                # Patterns without a '/' match the file name, like a shell glob
+                self.glob_on_path = "/" in filter_text
+
+        # Exclude globs follow the same name/path rule
+        self.exclude_names: List["re.Pattern"] = []
+        self.exclude_paths: List["re.Pattern"] = []
+        for pattern in (p.strip() for p in exclude.split(",")):
+            if pattern:
+                (self.exclude_paths if "/" in pattern else self.exclude_names).append(_compile_glob(pattern))
+
+    def _accepts_name(self, name: str) -> bool:
+        if self.extensions is not None:
+            lower = name.lower()
+            if not lower.endswith(self.extensions) and not any(g.match(name) for g in self.extension_globs):
+                return False
+        return not any(g.match(name) for g in self.exclude_names)
+
+    def filter_listing(self, entries) -> List[str]:
+        """Return the sorted relative paths (forward slashes) of matching files."""
+        files_list = []
+        for rel_dir, files in entries:
+            # Normalize to forward slashes for consistency
+            prefix = rel_dir.replace("\\", "/") + "/" if rel_dir else ""
+            # When the directory part already contains the text, every file matches it
+            contains = self.contains
+            if contains is not None and contains in prefix.lower():
+                contains = None
+
+            for name in files:
+                # Cheap checks on the file name first; only survivors get a relative path
+                if not self._accepts_name(name):
+                    continue
+                rel_path = prefix + name
+                if contains is not None and contains not in rel_path.lower():
+                    continue
+                if self.regex is not None and not self.regex.search(rel_path):
+                    continue
+                if self.glob is not None and not self.glob.match(rel_path if self.glob_on_path else name):
+                    continue
+                if self.exclude_paths and any(g.match(rel_path) for g in self.exclude_paths):
+                    continue
+                files_list.append(rel_path)
+
+        files_list.sort()
+        return files_list
+
+def _paginate_files(files_list: List[str], offset: int, limit: int, cursor: str) -> Tuple[List[str], int, Optional[str]]:
+    """Slice a sorted file list; returns (page, start index, next cursor)."""
+    start = bisect.bisect_right(files_list, cursor) if cursor else 0
+    start = min(start + offset, len(files_list))
+    end = start + limit if limit > 0 else len(files_list)
+    page = files_list[start:end]
+    next_cursor = page[-1] if page and end < len(files_list) else None
+    return page, start, next_cursor
+
 @PromptServer.instance.routes.get("/sg-nodes/list_files")
 async def list_files_endpoint(request):
     try:
@@ -476,47 +2140,50 @@ async def list_files_endpoint(request):
         extensions = request.rel_url.query.get("extensions", "").strip()
         filter_type = request.rel_url.query.get("filter_type", "none")
         filter_text = request.rel_url.query.get("filter_text", "")
+        exclude = request.rel_url.query.get("exclude", "")
+        # Pagination: offset/limit and/or an opaque cursor (last path of the previous page)
+        search = request.rel_url.query.get("search", "")
+        cursor = request.rel_url.query.get("cursor", "")
+        output_format = request.rel_url.query.get("format", "json")
+        try:
+            offset = max(0, int(request.rel_url.query.get("offset", 0)))
+            limit = max(0, int(request.rel_url.query.get("limit", 0)))
+        except ValueError:
+            return web.json_response({"files": [], "error": "offset and limit must be integers"}, status=400)
         
-        if not folder_path or not os.path.isdir(folder_path):
+        if not folder_path:
             return web.json_response({"files": []})
-        
-        # Parse extensions
-        ext_list = []
-        if extensions:
-            ext_list = [e.strip().lower() for e in extensions.split(",") if e.strip()]
-            # Ensure they start with dot
-            ext_list = [e if e.startswith(".") else f".{e}" for e in ext_list]
 
-        files_list = []
-        for root, dirs, files in os.walk(folder_path):
-            for file in files:
-                # Create relative path from the base folder
-                rel_path = os.path.relpath(os.path.join(root, file), folder_path)
-                # Normalize to forward slashes for consistency
-                rel_path = rel_path.replace("\\", "/")
-                
-                # Apply extension filter
-                if ext_list:
-                    if not any(file.lower().endswith(ext) for ext in ext_list):
-                        continue
-
-                # Apply additional filters
-                include = True
-                if filter_type == "contains" and filter_text:
-                    if filter_text.lower() not in rel_path.lower():
-                        include = False
-                elif filter_type == "regex" and filter_text:
-                    try:
-                        if not re.search(filter_text, rel_path, re.IGNORECASE):
-                            include = False
-                    except:
-                        pass # Invalid regex
-                
-                if include:
-                    files_list.append(rel_path)
-        
-        files_list.sort()
-        return web.json_response({"files": files_list})
+        try:
+            file_filter = FileFilter(extensions, filter_type, filter_text, exclude)
+        except ValueError as e:
+            return web.json_response({"files": [], "error": str(e)}, status=400)
+
+        # Walking and filtering run off the event loop
+        entries = await get_folder_listing_async(os.path.normpath(folder_path))
+        if entries is None:
+            return web.json_response({"files": []})
+
+        loop = asyncio.get_running_loop()
+        files_list = await loop.run_in_executor(None, file_filter.filter_listing, entries)
+        if search:
+            # Quick search while typing, on top of the regular filters
+            search = search.lower()
+            files_list = [f for f in files_list if search in f.lower()]
+
+        page, start, next_cursor = _paginate_files(files_list, offset, limit, cursor)
+
+        if output_format == "ndjson":
+            # One header line, then one JSON-encoded path per line, sent in batches
+            response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+            await response.prepare(request)
+            await response.write((json.dumps({"total": len(files_list), "offset": start, "next_cursor": next_cursor}) + "\n").encode())
+            for i in range(0, len(page), 1000):
+                await response.write("".join(json.dumps(f) + "\n" for f in page[i:i + 1000]).encode())
+            await response.write_eof()
+            return response
+
+        return web.json_response({"files": page, "total": len(files_list), "offset": start, "next_cursor": next_cursor})
     except Exception as e:
         print(f"Error listing files: {e}")
         return web.json_response({"files": []}, status=500)
@@ -528,9 +2195,12 @@ class SelectFileFromFolder(ComfyNodeABC):
             "required": {
                 "folder_path": ("STRING", {"default": "", "multiline": False}),
                 "extensions": ("STRING", {"default": "*", "multiline": False}),
-                "filter_type": (["none", "contains", "regex"],),
+                "filter_type": (["none", "contains", "regex", "glob"],),
                 "filter_text": ("STRING", {"default": "", "multiline": False}),
                 "file_name": ([""], {}), 
+            },
+            "optional": {
+                "exclude": ("STRING", {"default": "", "multiline": False, "tooltip": "Comma-separated glob patterns to hide (e.g. *.tmp, cache/*)."}),
             }
         }
 
@@ -543,9 +2213,13 @@ class SelectFileFromFolder(ComfyNodeABC):
     FUNCTION = "get_full_path"
     CATEGORY = "SGNodes/Utilities"
 
-    def get_full_path(self, folder_path, extensions, filter_type, filter_text, file_name):
+    def get_full_path(self, folder_path, extensions, filter_type, filter_text, file_name, exclude=""):
         if not folder_path or not file_name:
              return ("", "", "")
+
+        indexer = get_file_indexer()
+        if indexer is not None and indexer.contains(folder_path, file_name) is False:
+            print(f"Warning: {file_name} is not in the file index for {folder_path}")
         
         # input file_name is the relative path from the UI list
         relative_path = file_name
@@ -588,7 +2262,7 @@ class SelectFromList(ComfyNodeABC):
         
         def parse_json(data):
             try:
-                parsed = json.loads(data)
+                parsed = parse_json_cached(data)
                 if isinstance(parsed, list):
                     return parsed
                 return [parsed]
@@ -627,7 +2301,8 @@ class SelectFromList(ComfyNodeABC):
         
         for item in items:
             if str(item) == selected_value:
-                return (item,)
+                # Items may come from the shared JSON cache; hand out a private copy
+                return (copy.deepcopy(item) if isinstance(item, (dict, list)) else item,)
 
         return (selected_value,)
 
@@ -749,6 +2424,99 @@ class NonePrimitiveNode(ComfyNodeABC):
         return (None,)
 
 
+# Encoded audio clips for the browser, fetched as raw bytes instead of being
+# sent through the websocket as JSON. Clips are keyed by a hash of their
+# content and processing options, so a repeated sound is encoded and
+# downloaded once. LRU, bounded by count and total size.
+SOUND_STORE_MAX_ITEMS = 16
+SOUND_STORE_MAX_BYTES = 256 * 1024 * 1024
+_sound_store_lock = threading.Lock()
+# sound_id -> (payload, clip info sent to the browser)
+_sound_store: "OrderedDict[str, Tuple[bytes, Dict[str, Any]]]" = OrderedDict()
+_sound_store_bytes = 0
+
+def sound_content_id(waveform: "torch.Tensor", sample_rate: int, *options) -> str:
+    """Hash a waveform's samples together with the options used to encode it."""
+    samples = waveform.detach().cpu().float().contiguous().numpy()
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(repr((samples.dtype.str, samples.shape, sample_rate, options)).encode())
+    hasher.update(memoryview(samples).cast("B"))
+    return hasher.hexdigest()
+
+def get_stored_sound(sound_id: str) -> Optional[Dict[str, Any]]:
+    """Clip info for a stored sound, marking it as recently used."""
+    with _sound_store_lock:
+        entry = _sound_store.get(sound_id)
+        if entry is None:
+            return None
+        _sound_store.move_to_end(sound_id)
+        return entry[1]
+
+def store_sound(sound_id: str, payload: bytes, info: Dict[str, Any]) -> None:
+    """Keep an encoded clip for /sg-nodes/sound/{sound_id}."""
+    global _sound_store_bytes
+    with _sound_store_lock:
+        previous = _sound_store.pop(sound_id, None)
+        if previous is not None:
+            _sound_store_bytes -= len(previous[0])
+        _sound_store[sound_id] = (payload, info)
+        _sound_store_bytes += len(payload)
+        while len(_sound_store) > 1 and (len(_sound_store) > SOUND_STORE_MAX_ITEMS or _sound_store_bytes > SOUND_STORE_MAX_BYTES):
+            _, (evicted, _) = _sound_store.popitem(last=False)
+            _sound_store_bytes -= len(evicted)
+
+@PromptServer.instance.routes.get("/sg-nodes/sound/{sound_id}")
+async def sound_endpoint(request):
+    with _sound_store_lock:
+        entry = _sound_store.get(request.match_info["sound_id"])
+    if entry is None:
+        return web.Response(status=404)
+    # Content-addressed, so the browser may cache it for good
+    return web.Response(body=entry[0], content_type="application/octet-stream",
+                        headers={"Cache-Control": "private, max-age=31536000, immutable"})
+
+def preprocess_waveform(waveform: "torch.Tensor", sample_rate: int, downmix_mono: bool = False,
+                        target_sample_rate: int = 0, max_duration_seconds: float = 0.0) -> Tuple["torch.Tensor", int]:
+    """Trim, downmix and resample a (channels, frames) waveform for playback."""
+    waveform = waveform.detach().cpu().float()
+    # Trim first so the other steps only touch the samples that will be played
+    if max_duration_seconds > 0:
+        waveform = waveform[:, :max(1, int(max_duration_seconds * sample_rate))]
+    if downmix_mono and waveform.shape[0] > 1:
+        waveform = waveform.mean(dim=0, keepdim=True)
+    if target_sample_rate > 0 and target_sample_rate != sample_rate:
+        try:
+            import torchaudio.functional
+            waveform = torchaudio.functional.resample(waveform, sample_rate, target_sample_rate)
+        except ImportError:
+            frames = max(1, round(waveform.shape[1] * target_sample_rate / sample_rate))
+            waveform = torch.nn.functional.interpolate(waveform.unsqueeze(0), size=frames, mode="linear", align_corners=False).squeeze(0)
+        sample_rate = target_sample_rate
+    return waveform, sample_rate
+
+def encode_waveform(waveform: "torch.Tensor", sample_rate: int, encoding: str = "float32") -> Tuple[bytes, str]:
+    """Encode a (channels, frames) float waveform; returns (payload, format)."""
+    if encoding == "float32":
+        # Planar: all of channel 0, then channel 1, ...
+        return waveform.contiguous().numpy().tobytes(), "f32"
+
+    pcm = (waveform.clamp(-1.0, 1.0) * 32767.0).round().to(torch.int16)
+    if encoding == "int16":
+        return pcm.contiguous().numpy().tobytes(), "s16"
+
+    # 16-bit WAV, interleaved as the format requires
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(pcm.shape[0])
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm.t().contiguous().numpy().tobytes())
+    return buffer.getvalue(), "wav"
+
+
+# Lowest rate the Web Audio API accepts for an AudioBuffer
+MIN_PLAYBACK_SAMPLE_RATE = 3000
+
 class SGSoundPlayer(ComfyNodeABC):
     @classmethod
     def INPUT_TYPES(cls) -> InputTypeDict:
@@ -757,6 +2525,12 @@ class SGSoundPlayer(ComfyNodeABC):
                 "any_input": (IO.ANY, {}),
                 "audio": ("AUDIO",),
                 "volume": ("INT", {"default": 50, "min": 0, "max": 100}),
+            },
+            "optional": {
+                "downmix_mono": ("BOOLEAN", {"default": False, "tooltip": "Mix all channels down to mono before sending."}),
+                "target_sample_rate": ("INT", {"default": 0, "min": 0, "max": 192000, "tooltip": "Resample to this rate before sending (0 = keep the original rate). Browsers can't play rates below 3000 Hz, so lower values are raised to 3000."}),
+                "max_duration_seconds": ("FLOAT", {"default": 0.0, "min": 0.0, "max": 3600.0, "step": 0.1, "tooltip": "Only send the first N seconds (0 = full clip)."}),
+                "encoding": (["float32", "int16", "wav"], {"default": "float32", "tooltip": "Payload format sent to the browser. int16 and wav halve the size."}),
             }
         }
 
@@ -765,7 +2539,7 @@ class SGSoundPlayer(ComfyNodeABC):
     FUNCTION = "play_sound"
     CATEGORY = "SGNodes/Utilities"
 
-    def play_sound(self, any_input, audio, volume):
+    def play_sound(self, any_input, audio, volume, downmix_mono=False, target_sample_rate=0, max_duration_seconds=0.0, encoding="float32"):
         if audio and "waveform" in audio and "sample_rate" in audio:
             # audio is expected to be a dict with {"waveform": Tensor, "sample_rate": int}
             # waveform is typically (B, C, T) where B=batch, C=channels, T=time
@@ -776,16 +2550,32 @@ class SGSoundPlayer(ComfyNodeABC):
             if waveform.dim() == 3:
                 waveform = waveform[0]
             
-            # Convert to list for JSON serialization (sending via socket)
-            # Web Audio API expects channels as separate arrays
-            waveform_list = waveform.cpu().numpy().tolist()
-            
-            PromptServer.instance.send_sync("sg-nodes:play_sound", {
-                "waveform": waveform_list,
-                "sample_rate": sample_rate,
-                "volume": volume / 100.0
-            })
-            
+            if waveform.dim() == 1:
+                waveform = waveform.unsqueeze(0)
+
+            if 0 < target_sample_rate < MIN_PLAYBACK_SAMPLE_RATE:
+                print(f"Warning: target_sample_rate {target_sample_rate} Hz can't be played by browsers, using {MIN_PLAYBACK_SAMPLE_RATE} Hz")
+                target_sample_rate = MIN_PLAYBACK_SAMPLE_RATE
+
+            # A sound that was already played is neither processed nor sent again
+            sound_id = sound_content_id(waveform, sample_rate, downmix_mono, target_sample_rate, max_duration_seconds, encoding)
+            info = get_stored_sound(sound_id)
+            if info is None:
+                waveform, sample_rate = preprocess_waveform(waveform, sample_rate, downmix_mono, target_sample_rate, max_duration_seconds)
+                # Raw formats are planar, so the browser copies each channel straight
+                # into an AudioBuffer; wav is decoded by the browser itself
+                payload, payload_format = encode_waveform(waveform, sample_rate, encoding)
+                channels, frames = waveform.shape
+                info = {
+                    "sound_id": sound_id,
+                    "format": payload_format,
+                    "channels": channels,
+                    "frames": frames,
+                    "sample_rate": sample_rate,
+                }
+                store_sound(sound_id, payload, info)
+
+            PromptServer.instance.send_sync("sg-nodes:play_sound", {**info, "volume": volume / 100.0})
             
         return (any_input,)
 